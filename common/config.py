@@ -8,7 +8,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 CONFIG = {
     'tools': {
-        'required': ["waybackurls", "gau", "katana", "httpx", "unfurl", "fallparams", "gf"],
+        'required': ["waybackurls", "gau", "katana", "httpx", "fallparams", "gf"],
         'full_mode': ["jsluice", "trufflehog"],
         'python_tools': {
             # These paths are now relative to the project's root, making it more portable.
@@ -28,6 +28,7 @@ CONFIG = {
         # GitHub API Configuration
         'api_token_env': 'GITHUB_TOKEN',  # Environment variable name for GitHub API token
         'rate_limit_wait': 60,  # Seconds to wait when rate limited
+        'rate_limit_retries': 3,  # Retries of a rate-limited request before giving up
         
         # Tool Selection and Configuration
         'enabled_tools': {
@@ -44,11 +45,14 @@ CONFIG = {
         'max_repos_to_scan': 4,     # Maximum number of repositories to clone and scan
         'max_file_size_mb': 10,      # Maximum file size to scan (in MB)
         'clone_timeout': 300,         # Timeout for git clone operations (seconds)
+        'max_repo_size_kb': 512000,   # Skip repositories larger than this (GitHub API size, KB); 0 disables
         'scan_timeout': 600,          # Timeout for scanning operations (seconds)
+        'max_findings_per_repo': 5000,  # Stop a streaming TruffleHog scan after this many findings
         
         # Search Configuration
         'search_per_page': 100,       # Number of results per GitHub API page (max 100)
         'max_search_results': 1000,   # Maximum total search results to process
+        'search_workers': 4,          # Size of the one pool shared by all search queries and result pages
         
         # Advanced GitHub Dorks
         'search_queries': [
@@ -163,8 +167,11 @@ CONFIG = {
         # Performance Configuration
         'max_concurrent_repos': 3,    # Max concurrent repository processing
         'max_concurrent_scans': 4,    # Max concurrent scans per repo
+        'scan_workers': 2,            # Repositories analyzed at once while others are still cloning
+        'scan_queue_size': 4,         # Max cloned repositories waiting for analysis
         'cache_enabled': True,        # Enable API response caching
         'cache_ttl': 3600,           # Cache TTL in seconds (1 hour)
+        'scan_cache_ttl': 604800,    # Reuse a repository's analysis for the same HEAD commit (7 days)
     },
     'gitlab_scanner': {
         # GitLab API Configuration
@@ -183,11 +190,25 @@ CONFIG = {
         'max_file_size_mb': 10,      # Maximum file size to scan (in MB)
         'clone_timeout': 300,         # Timeout for git clone operations (seconds)
         'scan_timeout': 600,          # Timeout for scanning operations (seconds)
+        'sparse_exclude': [           # Paths left out of the sparse checkout (never downloaded)
+            '*.png', '*.jpg', '*.jpeg', '*.gif', '*.ico', '*.webp',
+            '*.mp4', '*.mp3', '*.woff', '*.woff2', '*.ttf', '*.eot',
+            '*.zip', '*.tar', '*.gz', '*.7z', '*.jar', '*.pdf',
+            'node_modules/',
+        ],
         
         # Search Configuration
-        'search_per_page': 100,       # Number of results per GitLab API page
+        'search_per_page': 100,       # Number of results per GitLab GraphQL page (max 100)
         'max_search_results': 1000,   # Maximum total search results to process
         
+        # Performance Configuration
+        'search_workers': 4,          # Concurrent search queries (each follows its own cursor)
+        'clone_workers': 4,           # Concurrent repository clones (network-bound)
+        'scan_workers': 2,            # Concurrent repository scans (CPU/disk-bound)
+        'scan_queue_size': 4,         # Max cloned repositories waiting to be scanned
+        'cache_enabled': True,        # Cache API responses on disk between runs
+        'cache_ttl': 86400,           # Cache TTL in seconds (24 hours)
+        
         # Secret Patterns for Custom Scanning
         'secret_patterns': {
             'api_keys': [
@@ -391,9 +412,20 @@ CONFIG = {
         'sqli_manual_results': 'sqli_manual_results.txt',
         'sqli_header_results': 'sqli_header_results.txt',
         'sqli_xor_results': 'sqli_xor_results.txt',
+        'dedup_hash_cache': 'dedup_hash_cache.db',
     },
     'download': {
         'max_concurrent': 20,
+        'max_per_host': 6,         # Concurrent deduplication connections per host
+        'hash_max_bytes': 262144,  # Deduplication hashes only this much of each body (256 KiB)
+        # HEAD every URL first and skip the download for URLs whose (host, ETag, Content-Length) is
+        # unique; URLs sharing a key are still all hashed. Saves transfer on hosts with stable ETags,
+        # but costs an extra round trip per URL, and a file kept on its ETag is not compared by
+        # content against files on other hosts or without an ETag
+        'head_prefilter': False,
+        'hash_cache_enabled': True,  # Reuse content hashes from previous runs (SQLite, per target)
+        'hash_cache_ttl': 86400,     # Hash cache TTL in seconds (24 hours)
+        'dns_cache_ttl': 300,        # Seconds a resolved host is reused by the deduplication fetcher
     },
     'validation': {
         'max_workers': 20,  # Reduced from 50 to prevent high CPU usage
@@ -416,6 +448,8 @@ CONFIG = {
     'sqli': {
         'timeout': 15,
         'delay_threshold': 7,
+        'screen_sleep': 2,           # Seconds slept by the screening payloads sent before the full 10s ones
+        'screen_threshold': 1.5,     # Screening delay over the baseline that triggers the full payload
         'max_workers': 10,
         'sqlmap_args': '--batch --random-agent --tamper=space2comment --level=5 --risk=3 --drop-set-cookie --threads 10 --dbs',
         'ghauri_args': '--batch --dbs --level 3 --confirm',
@@ -1,19 +1,48 @@
-from urllib.parse import urlparse
 from .config import CONFIG
 
 
 
+def url_path_lower(url):
+    """
+    Returns the lowercased path of a URL, the same as urlparse(url).path.lower().
+    Uses only str methods, which is several times faster than urlparse on large URL sets.
+    Args:
+        url (str): Absolute, scheme-relative or relative URL.
+    Returns:
+        str: Lowercased path without query, fragment or ;params.
+    """
+    head = url.partition('#')[0].partition('?')[0]
+    scheme_end = head.find('://')
+    if scheme_end != -1 and '/' not in head[:scheme_end]:
+        path_start = head.find('/', scheme_end + 3)
+    elif head.startswith('//'):
+        path_start = head.find('/', 2)
+    else:
+        path_start = 0
+    if path_start == -1:
+        return ''
+    path = head[path_start:]
+    # Like urlparse, ;params are only split off the last path segment
+    params_start = path.find(';', path.rfind('/') + 1)
+    if params_start != -1:
+        path = path[:params_start]
+    return path.lower()
+
+
 def find_urls_with_extension(urls, extension):
     """
     Returns a list of URLs that end with the given extension (case-insensitive).
     Args:
         urls (Iterable[str]): List or set of URLs.
-        extension (str): Extension to match (e.g., '.js').
+        extension (str or Iterable[str]): Extension(s) to match (e.g., '.js').
     Returns:
         List[str]: URLs ending with the given extension.
     """
-    ext = extension.lower()
-    return [url for url in urls if urlparse(url).path.lower().endswith(ext)]
+    if isinstance(extension, str):
+        ext = extension.lower()
+    else:
+        ext = tuple(e.lower() for e in extension)
+    return [url for url in urls if url_path_lower(url).endswith(ext)]
 
 
 def exclude_urls_with_extensions(urls, excluded_extensions=None):
@@ -26,11 +55,28 @@ def exclude_urls_with_extensions(urls, excluded_extensions=None):
     Returns:
         List[str]: URLs that don't end with any excluded extension.
     """
+    return list(iter_urls_without_excluded_extensions(urls, excluded_extensions))
+
+
+def iter_urls_without_excluded_extensions(urls, excluded_extensions=None):
+    """
+    Lazily yields the URLs that do NOT end with any of the excluded extensions,
+    so very large URL streams can be filtered without building a list.
+    Args:
+        urls (Iterable[str]): URLs to filter.
+        excluded_extensions (set, optional): Set of extensions to exclude.
+                                          If None, uses CONFIG['excluded_extensions'].
+    Yields:
+        str: URLs that don't end with any excluded extension.
+    """
     if excluded_extensions is None:
         excluded_extensions = CONFIG['excluded_extensions']
     
-    excluded_lower = {ext.lower() for ext in excluded_extensions}
-    return [url for url in urls if not any(urlparse(url).path.lower().endswith(ext) for ext in excluded_lower)]
+    # str.endswith takes a tuple, so each URL is checked against every extension in one call
+    excluded_lower = tuple({ext.lower() for ext in excluded_extensions})
+    for url in urls:
+        if not url_path_lower(url).endswith(excluded_lower):
+            yield url
 
 
 def write_lines_to_file(path, lines):
@@ -40,6 +86,5 @@ def write_lines_to_file(path, lines):
         path (str or Path): The file path to write to.
         lines (Iterable[str]): The lines to write.
     """
-    with open(path, 'w', encoding='utf-8') as f:
-        for line in lines:
-            f.write(f"{line}\n") 
\ No newline at end of file
+    with open(path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.writelines(f"{line}\n" for line in lines) 
\ No newline at end of file
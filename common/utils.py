@@ -1,15 +1,17 @@
 import os
 import subprocess
 import shutil
+import tempfile
+import threading
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Iterator, List, Tuple, Optional, Set
 from urllib.parse import urlparse
 
 def ensure_dir(path: Path) -> None:
     """Ensure a directory exists, creating it if necessary."""
     path.mkdir(parents=True, exist_ok=True)
 
-def run_command(cmd, timeout: int = 300, shell: bool = False) -> Tuple[int, str, str]:
+def run_command(cmd, timeout: int = 300, shell: bool = False, input: Optional[str] = None) -> Tuple[int, str, str]:
     """
     Run a command and return exit code, stdout, and stderr.
     
@@ -17,6 +19,7 @@ def run_command(cmd, timeout: int = 300, shell: bool = False) -> Tuple[int, str,
         cmd: List of command and arguments (or string if shell=True)
         timeout: Timeout in seconds
         shell: Whether to run command in shell (for pipelines)
+        input: Optional data to feed to the command's stdin
         
     Returns:
         Tuple of (exit_code, stdout, stderr)
@@ -28,6 +31,7 @@ def run_command(cmd, timeout: int = 300, shell: bool = False) -> Tuple[int, str,
             text=True,
             timeout=timeout,
             shell=shell,
+            input=input,
             env=os.environ.copy()  # Pass current environment including proxy vars
         )
         return result.returncode, result.stdout, result.stderr
@@ -39,6 +43,53 @@ def run_command(cmd, timeout: int = 300, shell: bool = False) -> Tuple[int, str,
     except Exception as e:
         return -1, "", str(e)
 
+def stream_lines(cmd: List[str], timeout: int, ok_codes: Tuple[int, ...] = (0,),
+                 errors: Optional[str] = None) -> Iterator[str]:
+    """
+    Run a command and yield its stdout lines as they are produced, so large outputs
+    are parsed incrementally instead of buffered whole.
+    
+    The process is killed when the caller stops iterating early, and once `timeout`
+    seconds have passed even if it is still writing, in which case
+    subprocess.TimeoutExpired is raised. An exit code outside `ok_codes` raises
+    subprocess.CalledProcessError after the last line, with the command's stderr
+    attached. stderr is spooled to a temporary file so a chatty process cannot
+    block on a full pipe while stdout is being read.
+    
+    Args:
+        cmd: List of command and arguments
+        timeout: Seconds before the process is killed
+        ok_codes: Exit codes that count as success
+        errors: Decoding error handler for stdout (e.g. 'ignore')
+    """
+    with tempfile.TemporaryFile('w+', errors='replace') as stderr_file:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, bufsize=1, text=True, errors=errors)
+        timed_out = threading.Event()
+        
+        def kill_on_timeout():
+            timed_out.set()
+            proc.kill()
+        
+        timer = threading.Timer(timeout, kill_on_timeout)
+        timer.start()
+        try:
+            yield from proc.stdout
+            proc.wait()
+        finally:
+            timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+        
+        stderr_file.seek(0)
+        stderr = stderr_file.read()
+    
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout, stderr=stderr)
+    if proc.returncode not in ok_codes:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr)
+
 def configure_proxy_session(session, config: dict) -> None:
     """
     Configure proxy settings for a requests session.
@@ -113,3 +164,58 @@ def run_uro(input_file: Path, output_file: Path, timeout: int = 300) -> Tuple[in
         return -1, '', "uro command not found"
     except Exception as e:
         return -1, '', str(e)
+
+def sort_unique_files(input_files, output_file: Path, timeout: int = 300) -> Tuple[int, str, str]:
+    """
+    Merge and deduplicate line-oriented files with GNU sort (external merge sort).
+    Uses the C locale so the output is byte-ordered and safe to feed into comm.
+    Returns (exit_code, stdout, stderr).
+    """
+    cmd = ["sort", "-u", "-o", str(output_file)] + [str(f) for f in input_files]
+    env = os.environ.copy()
+    env['LC_ALL'] = 'C'
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, env=env)
+        return result.returncode, result.stdout, result.stderr
+    except subprocess.TimeoutExpired:
+        return -1, '', f"sort timed out after {timeout} seconds"
+    except FileNotFoundError:
+        return -1, '', "sort command not found"
+    except Exception as e:
+        return -1, '', str(e)
+
+def diff_sorted_files(left_file: Path, right_file: Path, output_file: Path, timeout: int = 300) -> Tuple[int, str, str]:
+    """
+    Write the lines only present in left_file to output_file (comm -23).
+    Both inputs must already be sorted with sort_unique_files.
+    Returns (exit_code, stdout, stderr).
+    """
+    cmd = ["comm", "-23", str(left_file), str(right_file)]
+    env = os.environ.copy()
+    env['LC_ALL'] = 'C'
+    try:
+        with output_file.open('w') as out_f:
+            result = subprocess.run(cmd, stdout=out_f, stderr=subprocess.PIPE, text=True, timeout=timeout, env=env)
+        return result.returncode, '', result.stderr
+    except subprocess.TimeoutExpired:
+        return -1, '', f"comm timed out after {timeout} seconds"
+    except FileNotFoundError:
+        return -1, '', "comm command not found"
+    except Exception as e:
+        return -1, '', str(e)
+
+def count_lines(path: Path) -> int:
+    """Count non-empty lines in a file without loading it into memory."""
+    with open(path, 'rb') as f:
+        return sum(1 for line in f if line.strip())
+
+def read_unique_lines(path: Path) -> Set[str]:
+    """
+    Read a (potentially huge) line-oriented file into a set of unique stripped lines.
+    The file is streamed in binary mode and deduplicated at the bytes level as it is
+    read, so memory holds only the unique lines and only those are decoded to str.
+    """
+    with open(path, 'rb') as f:
+        raw_lines = {line.strip() for line in f}
+    raw_lines.discard(b'')
+    return {line.decode('utf-8', errors='replace') for line in raw_lines}
@@ -6,7 +6,7 @@ from common.config import CONFIG
 from common.logger import Logger
 from common.help_ui import show_help, show_command_help
 from common.tool_checker import check_tools
-from common.utils import ensure_dir
+from common.utils import ensure_dir, read_unique_lines
 
 # Import run functions from all modules
 from discovery.crawler import run as discovery_run
@@ -185,8 +185,7 @@ def main():
         if args.independent and args.input:
             try:
                 logger.info(f"Loading URLs from input file: {args.input}")
-                with args.input.open('r') as f:
-                    urls = set(line.strip() for line in f if line.strip())
+                urls = read_unique_lines(args.input)
                 workflow_data['all_urls'] = urls
                 logger.info(f"Loaded {len(urls)} URLs from input file")
             except Exception as e:
@@ -178,13 +178,12 @@ def run(args: Any, config: Dict, logger: Logger, workflow_data: Dict) -> Dict:
         
         uro_urls = None
         if hasattr(args, 'uro') and args.uro:
-            from common.utils import run_uro
+            from common.utils import run_uro, read_unique_lines
             uro_file = target_output_dir / config['files']['uro_urls']
             exit_code, _, uro_stderr = run_uro(target_output_dir / all_urls_file, uro_file)
             if exit_code == 0:
                 logger.success(f"Uro deduplication complete. Shortened URLs saved to {uro_file}")
-                with uro_file.open('r') as f:
-                    uro_urls = set(line.strip() for line in f if line.strip())
+                uro_urls = read_unique_lines(uro_file)
             else:
                 logger.error(f"Uro failed: {uro_stderr}")
                 uro_urls = set()
@@ -1,12 +1,13 @@
 import json
 import re
+import tempfile
 from pathlib import Path
 from typing import Dict, Any, Set
 from urllib.parse import urlparse
 from tqdm import tqdm
 
 from common.logger import Logger
-from common.utils import run_command, ensure_dir
+from common.utils import run_command, ensure_dir, sort_unique_files, diff_sorted_files, count_lines
 
 """
 FuzzingJS Module for MJSRecon
@@ -45,25 +46,48 @@ def run(args: Any, config: Dict, logger: Logger, workflow_data: Dict) -> Dict:
         permutation_wordlist = generate_permutation_wordlist(js_filenames, ffuf_results_dir, config)
         logger.info(f"[{target}] Generated {len(permutation_wordlist.read_text().splitlines())} permutations.")
 
-    fuzzing_results = set()
-    with tqdm(total=len(unique_paths), desc=f"[{target}] Fuzzing paths", unit="path", leave=False) as pbar:
-        for dir_path, base_url in unique_paths.items():
-            found_urls = execute_fuzzing_for_path(
-                base_url, dir_path, ffuf_results_dir, args, config, permutation_wordlist, logger
-            )
-            fuzzing_results.update(found_urls)
-            pbar.update(1)
-
-    new_findings = fuzzing_results - live_urls
-    logger.success(f"[{target}] Fuzzing complete. Found {len(fuzzing_results)} total URLs, including {len(new_findings)} new ones.")
-
-    (target_output_dir / config['files']['fuzzing_all']).write_text('\n'.join(sorted(fuzzing_results)))
-    (target_output_dir / config['files']['fuzzing_new']).write_text('\n'.join(sorted(new_findings)))
+    # Spill discovered URLs to disk as they arrive and let GNU sort do the
+    # dedup/ordering, so huge scans never hold the whole result set in memory.
+    fuzzing_all_file = target_output_dir / config['files']['fuzzing_all']
+    fuzzing_new_file = target_output_dir / config['files']['fuzzing_new']
+    with tempfile.TemporaryDirectory(dir=ffuf_results_dir) as tmp_dir:
+        raw_results_file = Path(tmp_dir) / "fuzzing_raw.txt"
+        live_sorted_file = Path(tmp_dir) / "live_sorted.txt"
+
+        with raw_results_file.open('w') as raw_f:
+            with tqdm(total=len(unique_paths), desc=f"[{target}] Fuzzing paths", unit="path", leave=False) as pbar:
+                for dir_path, base_url in unique_paths.items():
+                    found_urls = execute_fuzzing_for_path(
+                        base_url, dir_path, ffuf_results_dir, args, config, permutation_wordlist, logger
+                    )
+                    for url in found_urls:
+                        raw_f.write(f"{url}\n")
+                    pbar.update(1)
+
+        with live_sorted_file.open('w') as live_f:
+            for url in live_urls:
+                live_f.write(f"{url}\n")
+
+        timeout = config['timeouts']['command']
+        for input_file, output_file in ((raw_results_file, fuzzing_all_file), (live_sorted_file, live_sorted_file)):
+            exit_code, _, stderr = sort_unique_files([input_file], output_file, timeout=timeout)
+            if exit_code != 0:
+                logger.error(f"[{target}] Failed to sort fuzzing results: {stderr}")
+                return {"fuzzing_summary": {"status": "failed"}}
+
+        exit_code, _, stderr = diff_sorted_files(fuzzing_all_file, live_sorted_file, fuzzing_new_file, timeout=timeout)
+        if exit_code != 0:
+            logger.error(f"[{target}] Failed to diff fuzzing results against live URLs: {stderr}")
+            return {"fuzzing_summary": {"status": "failed"}}
+
+    total_found = count_lines(fuzzing_all_file)
+    new_found = count_lines(fuzzing_new_file)
+    logger.success(f"[{target}] Fuzzing complete. Found {total_found} total URLs, including {new_found} new ones.")
 
     return {
         "fuzzing_summary": {
-            "total_found": len(fuzzing_results),
-            "new_found": len(new_findings),
+            "total_found": total_found,
+            "new_found": new_found,
         }
     }
 
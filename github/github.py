@@ -12,17 +12,29 @@ import tempfile
 import shutil
 import hashlib
 import pickle
+import queue
+import threading
 from pathlib import Path
 from urllib.parse import urlparse, quote
 from typing import List, Dict, Set, Optional, Tuple, Any
 import re
 from datetime import datetime, timedelta
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import base64
+import bisect
 
 from common.logger import Logger
-from common.utils import ensure_dir
+from common.utils import ensure_dir, stream_lines
+
+NEWLINE_RE = re.compile('\n')
+
+# API responses shared by every GitHubRecon in this process, keyed by request URL.
+# Targets that reduce to the same org name reuse each other's search pages.
+_RESPONSE_CACHE: Dict[str, Tuple[float, Dict]] = {}
+_RESPONSE_CACHE_LOCK = threading.Lock()
 
 class GitHubRecon:
     def __init__(self, target: str, output_dir: Path, logger: Logger, config: Dict):
@@ -43,10 +55,29 @@ class GitHubRecon:
         self.github_api_base = "https://api.github.com"
         self.github_search_base = "https://api.github.com/search"
         
+        # Shared keep-alive session so API calls reuse pooled TCP/TLS connections
+        self.session = requests.Session()
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False  # 403/429 rate limits are handled in _make_github_request
+        )
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': 'MJSRecon/1.0',
+            'Accept': 'application/vnd.github.v3+json'
+        })
+        if self.github_token:
+            self.session.headers['Authorization'] = f'token {self.github_token}'
+        
         # Rate limiting
         self.rate_limit_remaining = 5000
         self.rate_limit_reset = 0
         self.rate_limit_wait = github_config.get('rate_limit_wait', 60)
+        self.rate_limit_retries = github_config.get('rate_limit_retries', 3)
         
         # Results storage
         self.repositories = []
@@ -78,11 +109,14 @@ class GitHubRecon:
         self.max_repos_to_scan = github_config.get('max_repos_to_scan', 10)
         self.max_file_size_mb = github_config.get('max_file_size_mb', 10)
         self.clone_timeout = github_config.get('clone_timeout', 300)
+        self.max_repo_size_kb = github_config.get('max_repo_size_kb', 512000)
         self.scan_timeout = github_config.get('scan_timeout', 600)
+        self.max_findings_per_repo = github_config.get('max_findings_per_repo', 5000)
         
         # Search configuration from config
         self.search_per_page = github_config.get('search_per_page', 100)
         self.max_search_results = github_config.get('max_search_results', 1000)
+        self.search_workers = github_config.get('search_workers', 4)
         
         # Search queries from config
         self.search_queries = github_config.get('search_queries', [])
@@ -95,14 +129,22 @@ class GitHubRecon:
         self.save_users = github_config.get('save_users', True)
         self.generate_report = github_config.get('generate_report', True)
         
-        # Secret patterns from config
+        # Secret patterns from config, compiled once for every file scanned
         self.secret_patterns = github_config.get('secret_patterns', {})
+        self.compiled_secret_patterns = [
+            (pattern_type, re.compile(pattern, re.IGNORECASE | re.MULTILINE))
+            for pattern_type, patterns in self.secret_patterns.items()
+            for pattern in patterns
+        ]
         
         # Performance configuration from config
         self.max_concurrent_repos = github_config.get('max_concurrent_repos', 3)
         self.max_concurrent_scans = github_config.get('max_concurrent_scans', 4)
+        self.scan_workers = github_config.get('scan_workers', 2)
+        self.scan_queue_size = github_config.get('scan_queue_size', 4)
         self.cache_enabled = github_config.get('cache_enabled', True)
         self.cache_ttl = github_config.get('cache_ttl', 3600)
+        self.scan_cache_ttl = github_config.get('scan_cache_ttl', 604800)
 
     def _check_tool(self, tool_name: str) -> bool:
         """Check if a tool is available in PATH"""
@@ -115,14 +157,23 @@ class GitHubRecon:
 
     def _get_cached_response(self, url: str) -> Optional[Dict]:
         """Get cached API response if available and not expired"""
+        if not self.cache_enabled:
+            return None
+        
+        with _RESPONSE_CACHE_LOCK:
+            entry = _RESPONSE_CACHE.get(url)
+        if entry and time.time() - entry[0] < self.cache_ttl:
+            return entry[1]
+        
         cache_file = self.cache_dir / f"{hashlib.md5(url.encode()).hexdigest()}.pkl"
         
         if cache_file.exists():
             try:
                 with open(cache_file, 'rb') as f:
                     cached_data = pickle.load(f)
-                    # Check if cache is less than 1 hour old
-                    if time.time() - cached_data['timestamp'] < 3600:
+                    if time.time() - cached_data['timestamp'] < self.cache_ttl:
+                        with _RESPONSE_CACHE_LOCK:
+                            _RESPONSE_CACHE[url] = (cached_data['timestamp'], cached_data['data'])
                         return cached_data['data']
             except Exception:
                 pass
@@ -130,13 +181,43 @@ class GitHubRecon:
     
     def _cache_response(self, url: str, data: Dict):
         """Cache API response"""
+        if not self.cache_enabled:
+            return
+        
+        timestamp = time.time()
+        with _RESPONSE_CACHE_LOCK:
+            _RESPONSE_CACHE[url] = (timestamp, data)
+        
         cache_file = self.cache_dir / f"{hashlib.md5(url.encode()).hexdigest()}.pkl"
         try:
             with open(cache_file, 'wb') as f:
-                pickle.dump({'data': data, 'timestamp': time.time()}, f)
+                pickle.dump({'data': data, 'timestamp': timestamp}, f)
         except Exception:
             pass
 
+    def _rate_limit_wait(self, response: requests.Response) -> Optional[float]:
+        """
+        Seconds to wait before retrying a rate-limited response, or None if it was not rate limited.
+        Covers the primary limit (X-RateLimit-Remaining: 0) and the secondary limits, which answer
+        403 or 429 with a Retry-After header, or with neither header and wait at least a minute.
+        """
+        if response.status_code not in (403, 429):
+            return None
+        
+        if 'X-RateLimit-Remaining' in response.headers:
+            self.rate_limit_remaining = int(response.headers['X-RateLimit-Remaining'])
+            self.rate_limit_reset = int(response.headers.get('X-RateLimit-Reset', 0))
+        
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return int(retry_after)
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            reset_time = datetime.fromtimestamp(self.rate_limit_reset)
+            return max((reset_time - datetime.now()).total_seconds(), 0) + 1
+        if response.status_code == 429 or 'rate limit' in response.text.lower():
+            return self.rate_limit_wait
+        return None
+
     def _make_github_request(self, url: str, headers: Dict = None) -> Dict:
         """Make a GitHub API request with caching"""
         # Check cache first
@@ -144,29 +225,17 @@ class GitHubRecon:
         if cached_data:
             return cached_data
         
-        if headers is None:
-            headers = {}
-        
-        if self.github_token:
-            headers['Authorization'] = f'token {self.github_token}'
-        
-        headers['Accept'] = 'application/vnd.github.v3+json'
-        
         try:
-            response = requests.get(url, headers=headers, timeout=30)
-            
-            # Handle rate limiting
-            if response.status_code == 403 and 'X-RateLimit-Remaining' in response.headers:
-                self.rate_limit_remaining = int(response.headers['X-RateLimit-Remaining'])
-                self.rate_limit_reset = int(response.headers['X-RateLimit-Reset'])
+            for attempt in range(self.rate_limit_retries + 1):
+                # Auth and Accept headers come from the session; extra headers override per request
+                response = self.session.get(url, headers=headers, timeout=30)
                 
-                if self.rate_limit_remaining == 0:
-                    reset_time = datetime.fromtimestamp(self.rate_limit_reset)
-                    wait_time = (reset_time - datetime.now()).total_seconds()
-                    if wait_time > 0:
-                        self.logger.warning(f'Rate limit exceeded. Waiting {wait_time:.0f} seconds...')
-                        time.sleep(wait_time)
-                        return self._make_github_request(url, headers)
+                # Handle rate limiting
+                wait_time = self._rate_limit_wait(response)
+                if wait_time is None or attempt == self.rate_limit_retries:
+                    break
+                self.logger.warning(f'Rate limit exceeded. Waiting {wait_time:.0f} seconds...')
+                time.sleep(wait_time)
             
             response.raise_for_status()
             json_data = response.json()
@@ -181,78 +250,108 @@ class GitHubRecon:
             self.logger.error(f'GitHub API request failed: {e}')
             return {}
 
+    def _build_search_url(self, query: str, page: int = 1) -> str:
+        """Build a repository search URL for one results page"""
+        # Build URL manually to avoid encoding colons and other special characters
+        # that GitHub search API expects to remain unencoded
+        base_url = f"{self.github_search_base}/repositories"
+        params = {
+            'q': query,
+            'sort': 'updated',
+            'order': 'desc',
+            'per_page': str(self.search_per_page),
+            'page': str(page)
+        }
+        
+        # Construct URL manually to avoid encoding issues
+        param_strings = []
+        for key, value in params.items():
+            if key == 'q':
+                # Don't encode the query parameter - GitHub expects it as-is
+                param_strings.append(f"{key}={value}")
+            else:
+                param_strings.append(f"{key}={quote(str(value))}")
+        
+        return f"{base_url}?{'&'.join(param_strings)}"
+
+    def _repo_record(self, repo: Dict, query: str) -> Dict:
+        """Reduce a search API repository item to the fields kept in the results"""
+        return {
+            'name': repo['full_name'],
+            'description': repo.get('description', ''),
+            'url': repo['html_url'],
+            'clone_url': repo['clone_url'],
+            'ssh_url': repo['ssh_url'],
+            'language': repo.get('language', ''),
+            'stars': repo['stargazers_count'],
+            'forks': repo['forks_count'],
+            'updated_at': repo['updated_at'],
+            'created_at': repo['created_at'],
+            'size': repo['size'],
+            'default_branch': repo['default_branch'],
+            'topics': repo.get('topics', []),
+            'search_query': query
+        }
+
     def search_repositories(self) -> List[Dict]:
-        """Search for repositories related to the target"""
+        """
+        Search for repositories related to the target.
+        
+        The first page of every query is fetched concurrently. Further pages are only
+        requested while the max_search_results budget, shared by all queries in query
+        order, is not used up, and all requests go through one pool of search_workers
+        threads, so the search API sees a bounded number of calls.
+        """
         self.logger.info(f'[{self.target}] Searching for repositories...')
         self.logger.debug(f'[{self.target}] Search limits: {self.search_per_page} per page, max {self.max_search_results} total results')
         
         repositories = []
         
-        for query_template in self.search_queries:
-            try:
-                # Replace {target} placeholder with actual target
-                org_name = self.target.split('.')[0] if '.' in self.target else self.target
-                
-                query = query_template.replace('{target}', org_name)
+        # Replace {target} placeholder with actual target
+        org_name = self.target.split('.')[0] if '.' in self.target else self.target
+        # Templates can collapse to the same query; search each distinct query once
+        queries = list(dict.fromkeys(query_template.replace('{target}', org_name) for query_template in self.search_queries))
+        
+        items_by_query: Dict[str, List[Dict]] = {query: [] for query in queries}
+        with ThreadPoolExecutor(max_workers=max(1, self.search_workers)) as executor:
+            first_pages = {query: executor.submit(self._make_github_request, self._build_search_url(query)) for query in queries}
+            
+            # Spend what is left of the budget on further pages, earlier queries first
+            budget = self.max_search_results
+            page_futures = []
+            for query in queries:
+                try:
+                    first_page = first_pages[query].result()
+                except Exception as e:
+                    self.logger.error(f'[{self.target}] Error searching repositories with query "{query}": {e}')
+                    continue
                 self.logger.debug(f'[{self.target}] Searching with query: {query}')
+                items_by_query[query].extend(first_page.get('items', []))
+                budget -= len(items_by_query[query])
                 
-                # Build URL manually to avoid encoding colons and other special characters
-                # that GitHub search API expects to remain unencoded
-                base_url = f"{self.github_search_base}/repositories"
-                params = {
-                    'q': query,
-                    'sort': 'updated',
-                    'order': 'desc',
-                    'per_page': str(self.search_per_page)
-                }
-                
-                # Construct URL manually to avoid encoding issues
-                param_strings = []
-                for key, value in params.items():
-                    if key == 'q':
-                        # Don't encode the query parameter - GitHub expects it as-is
-                        param_strings.append(f"{key}={value}")
-                    else:
-                        param_strings.append(f"{key}={quote(str(value))}")
-                
-                url = f"{base_url}?{'&'.join(param_strings)}"
-                results = self._make_github_request(url)
-                
-                if 'items' in results:
-                    for repo in results['items']:
-                        repo_info = {
-                            'name': repo['full_name'],
-                            'description': repo.get('description', ''),
-                            'url': repo['html_url'],
-                            'clone_url': repo['clone_url'],
-                            'ssh_url': repo['ssh_url'],
-                            'language': repo.get('language', ''),
-                            'stars': repo['stargazers_count'],
-                            'forks': repo['forks_count'],
-                            'updated_at': repo['updated_at'],
-                            'created_at': repo['created_at'],
-                            'size': repo['size'],
-                            'default_branch': repo['default_branch'],
-                            'topics': repo.get('topics', []),
-                            'search_query': query
-                        }
-                        repositories.append(repo_info)
-                        
-                        # Check if we've reached the maximum search results limit
-                        if len(repositories) >= self.max_search_results:
-                            self.logger.info(f'[{self.target}] Reached maximum search results limit ({self.max_search_results})')
-                            break
-                        
-                # Respect rate limits
-                time.sleep(1)
-                
-                # Break if we've reached the limit
-                if len(repositories) >= self.max_search_results:
-                    break
-                
-            except Exception as e:
-                self.logger.error(f'[{self.target}] Error searching repositories with query "{query}": {e}')
-                continue
+                # GitHub search never returns more than 1000 results per query
+                total = min(first_page.get('total_count', 0), 1000)
+                remaining = min(total - len(items_by_query[query]), max(budget, 0))
+                extra_pages = -(-remaining // self.search_per_page)
+                budget -= remaining
+                page_futures.extend(
+                    (query, executor.submit(self._make_github_request, self._build_search_url(query, page)))
+                    for page in range(2, extra_pages + 2)
+                )
+            
+            for query, future in page_futures:
+                try:
+                    items_by_query[query].extend(future.result().get('items', []))
+                except Exception as e:
+                    self.logger.error(f'[{self.target}] Error searching repositories with query "{query}": {e}')
+        
+        for query in queries:
+            repositories.extend(self._repo_record(repo, query) for repo in items_by_query[query])
+        
+        # Check if we've reached the maximum search results limit
+        if len(repositories) >= self.max_search_results:
+            self.logger.info(f'[{self.target}] Reached maximum search results limit ({self.max_search_results})')
+            repositories = repositories[:self.max_search_results]
         
         # Remove duplicates
         seen = set()
@@ -357,9 +456,16 @@ class GitHubRecon:
             
             self.logger.info(f'[{self.target}] Cloning repository: {repo_name}')
             
-            # Use shallow clone for faster download
-            cmd = ['git', 'clone', '--depth', '1', repo_url, str(clone_dir)]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.clone_timeout)
+            # Shallow, single-branch, tagless partial clone: only the tip commit and its trees
+            # are sent up front, and checkout then fetches the blobs it needs in one batch.
+            # (tree:0 would also defer trees, costing a round-trip per directory on checkout.)
+            cmd = [
+                'git', '-c', 'protocol.version=2', 'clone',
+                '--depth', '1', '--single-branch', '--no-tags', '--filter=blob:none',
+                repo_url, str(clone_dir)
+            ]
+            env = {**os.environ, 'GIT_TERMINAL_PROMPT': '0'}  # Fail fast instead of prompting for credentials
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.clone_timeout, env=env)
             
             if result.returncode == 0:
                 self.logger.success(f'[{self.target}] Successfully cloned {repo_name}')
@@ -376,120 +482,112 @@ class GitHubRecon:
             return None
 
     def scan_with_trufflehog(self, repo_path: Path) -> List[Dict]:
-        """Scan repository with TruffleHog"""
+        """Scan repository with TruffleHog; a timeout or non-zero exit is raised to the caller"""
         secrets = []
         
         if not self.tools['trufflehog']:
             self.logger.warning(f'[{self.target}] TruffleHog not found, skipping TruffleHog scan')
             return secrets
         
-        try:
-            self.logger.debug(f'[{self.target}] Scanning {repo_path.name} with TruffleHog')
-            
-            cmd = ['trufflehog', '--json', str(repo_path)]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.scan_timeout)
-            
-            if result.returncode == 0 and result.stdout:
-                for line in result.stdout.strip().split('\n'):
-                    if line.strip():
-                        try:
-                            secret_data = json.loads(line)
-                            secrets.append({
-                                'tool': 'trufflehog',
-                                'file': secret_data.get('path', ''),
-                                'line': secret_data.get('line', ''),
-                                'commit': secret_data.get('commit', ''),
-                                'secret': secret_data.get('raw', ''),
-                                'reason': secret_data.get('reason', ''),
-                                'repo': repo_path.name
-                            })
-                        except json.JSONDecodeError:
-                            continue
-            
-            self.logger.success(f'[{self.target}] TruffleHog found {len(secrets)} secrets in {repo_path.name}')
-            
-        except subprocess.TimeoutExpired:
-            self.logger.error(f'[{self.target}] TruffleHog scan timeout for {repo_path.name}')
-        except Exception as e:
-            self.logger.error(f'[{self.target}] Error running TruffleHog on {repo_path.name}: {e}')
+        self.logger.debug(f'[{self.target}] Scanning {repo_path.name} with TruffleHog')
+        
+        cmd = ['trufflehog', '--json', str(repo_path)]
+        for line in stream_lines(cmd, self.scan_timeout):
+            try:
+                secret_data = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            secrets.append({
+                'tool': 'trufflehog',
+                'file': secret_data.get('path', ''),
+                'line': secret_data.get('line', ''),
+                'commit': secret_data.get('commit', ''),
+                'secret': secret_data.get('raw', ''),
+                'reason': secret_data.get('reason', ''),
+                'repo': repo_path.name
+            })
+            if len(secrets) >= self.max_findings_per_repo:
+                self.logger.warning(f'[{self.target}] TruffleHog stopped after {len(secrets)} findings in {repo_path.name}')
+                break
+        
+        self.logger.success(f'[{self.target}] TruffleHog found {len(secrets)} secrets in {repo_path.name}')
         
         return secrets
 
     def scan_with_gitleaks(self, repo_path: Path) -> List[Dict]:
-        """Scan repository with GitLeaks"""
+        """Scan repository with GitLeaks; a timeout or non-zero exit is raised to the caller"""
         secrets = []
         
         if not self.tools['gitleaks']:
             self.logger.warning(f'[{self.target}] GitLeaks not found, skipping GitLeaks scan')
             return secrets
         
-        try:
-            self.logger.debug(f'[{self.target}] Scanning {repo_path.name} with GitLeaks')
-            
-            cmd = ['gitleaks', 'detect', '--source', str(repo_path), '--report-format', 'json', '--report-path', '/dev/stdout']
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.scan_timeout)
-            
-            if result.returncode == 0 and result.stdout:
-                try:
-                    leaks_data = json.loads(result.stdout)
-                    for leak in leaks_data:
-                        secrets.append({
-                            'tool': 'gitleaks',
-                            'file': leak.get('File', ''),
-                            'line': leak.get('Line', ''),
-                            'commit': leak.get('Commit', ''),
-                            'secret': leak.get('Secret', ''),
-                            'rule': leak.get('Rule', ''),
-                            'repo': repo_path.name
-                        })
-                except json.JSONDecodeError:
-                    pass
-            
-            self.logger.success(f'[{self.target}] GitLeaks found {len(secrets)} secrets in {repo_path.name}')
-            
-        except subprocess.TimeoutExpired:
-            self.logger.error(f'[{self.target}] GitLeaks scan timeout for {repo_path.name}')
-        except Exception as e:
-            self.logger.error(f'[{self.target}] Error running GitLeaks on {repo_path.name}: {e}')
+        self.logger.debug(f'[{self.target}] Scanning {repo_path.name} with GitLeaks')
+        
+        # Gitleaks exits 1 when it finds leaks unless told otherwise; with --exit-code 0
+        # any non-zero exit is a real failure
+        cmd = ['gitleaks', 'detect', '--source', str(repo_path), '--report-format', 'json', '--report-path', '/dev/stdout',
+               '--exit-code', '0']
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.scan_timeout)
+        if result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, cmd, stderr=result.stderr)
+        
+        if result.stdout:
+            try:
+                leaks_data = json.loads(result.stdout)
+                for leak in leaks_data:
+                    secrets.append({
+                        'tool': 'gitleaks',
+                        'file': leak.get('File', ''),
+                        'line': leak.get('Line', ''),
+                        'commit': leak.get('Commit', ''),
+                        'secret': leak.get('Secret', ''),
+                        'rule': leak.get('Rule', ''),
+                        'repo': repo_path.name
+                    })
+            except json.JSONDecodeError:
+                pass
+        
+        self.logger.success(f'[{self.target}] GitLeaks found {len(secrets)} secrets in {repo_path.name}')
         
         return secrets
 
     def scan_with_custom_patterns(self, repo_path: Path) -> List[Dict]:
-        """Scan repository with custom secret patterns"""
+        """Scan repository with custom secret patterns; unreadable files are skipped, other errors are raised"""
         secrets = []
         
-        try:
-            self.logger.debug(f'[{self.target}] Scanning {repo_path.name} with custom patterns')
-            
-            for file_path in repo_path.rglob('*'):
-                if file_path.is_file() and file_path.stat().st_size < self.max_file_size_mb * 1024 * 1024:  # Skip files > 10MB
-                    try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
+        self.logger.debug(f'[{self.target}] Scanning {repo_path.name} with custom patterns')
+        
+        for file_path in repo_path.rglob('*'):
+            if file_path.is_file() and file_path.stat().st_size < self.max_file_size_mb * 1024 * 1024:  # Skip files > 10MB
+                try:
+                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                        content = f.read()
+                        
+                    # Line offsets are computed once per file, and only if something matched
+                    lines = None
+                    newline_offsets = None
+                    for pattern_type, regex in self.compiled_secret_patterns:
+                        for match in regex.finditer(content):
+                            if lines is None:
+                                lines = content.split('\n')
+                                newline_offsets = [m.start() for m in NEWLINE_RE.finditer(content)]
+                            line_num = bisect.bisect_left(newline_offsets, match.start()) + 1
+                            line_content = lines[line_num - 1] if line_num <= len(lines) else ''
                             
-                        for pattern_type, patterns in self.secret_patterns.items():
-                            for pattern in patterns:
-                                matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
-                                for match in matches:
-                                    line_num = content[:match.start()].count('\n') + 1
-                                    line_content = content.split('\n')[line_num - 1] if line_num <= len(content.split('\n')) else ''
-                                    
-                                    secrets.append({
-                                        'tool': 'custom_patterns',
-                                        'pattern_type': pattern_type,
-                                        'file': str(file_path.relative_to(repo_path)),
-                                        'line': line_num,
-                                        'line_content': line_content.strip(),
-                                        'secret': match.group(0),
-                                        'repo': repo_path.name
-                                    })
-                    except Exception as e:
-                        continue
-            
-            self.logger.success(f'[{self.target}] Custom patterns found {len(secrets)} secrets in {repo_path.name}')
-            
-        except Exception as e:
-            self.logger.error(f'[{self.target}] Error scanning {repo_path.name} with custom patterns: {e}')
+                            secrets.append({
+                                'tool': 'custom_patterns',
+                                'pattern_type': pattern_type,
+                                'file': str(file_path.relative_to(repo_path)),
+                                'line': line_num,
+                                'line_content': line_content.strip(),
+                                'secret': match.group(0),
+                                'repo': repo_path.name
+                            })
+                except Exception as e:
+                    continue
+        
+        self.logger.success(f'[{self.target}] Custom patterns found {len(secrets)} secrets in {repo_path.name}')
         
         return secrets
 
@@ -626,41 +724,40 @@ class GitHubRecon:
             self.logger.debug(f'[{self.target}] DEBUG: trufflehog_github_org enabled: {self.tools.get("trufflehog_github_org")}, trufflehog in PATH: {self.tools.get("trufflehog")}, github_token: {self.github_token}')
             
             cmd = ['trufflehog', 'github', '--org', org_name, '--token', self.github_token, '--json']
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.scan_timeout)
-            
-            if result.returncode == 0 and result.stdout:
-                for line in result.stdout.strip().split('\n'):
-                    if line.strip():
-                        try:
-                            data = json.loads(line)
-                            
-                            # Only process lines that contain secret findings (have SourceMetadata and DetectorName)
-                            if 'SourceMetadata' in data and 'DetectorName' in data:
-                                source_metadata = data.get('SourceMetadata', {})
-                                github_data = source_metadata.get('Data', {}).get('Github', {})
-                                
-                                secrets.append({
-                                    'tool': 'trufflehog_github_org',
-                                    'file': github_data.get('file', ''),
-                                    'line': github_data.get('line', ''),
-                                    'commit': github_data.get('commit', ''),
-                                    'secret': data.get('Raw', ''),
-                                    'reason': data.get('DetectorName', ''),
-                                    'repo': github_data.get('repository', ''),
-                                    'org': org_name,
-                                    'link': github_data.get('link', ''),
-                                    'timestamp': github_data.get('timestamp', ''),
-                                    'email': github_data.get('email', ''),
-                                    'detector_description': data.get('DetectorDescription', ''),
-                                    'verified': data.get('Verified', False),
-                                    'redacted': data.get('Redacted', '')
-                                })
-                            
-                        except json.JSONDecodeError as e:
-                            # Skip log messages and other non-JSON lines
-                            if not line.startswith('{"level":'):
-                                self.logger.debug(f'[{self.target}] Failed to parse JSON line: {line[:100]}... Error: {e}')
-                            continue
+            for line in stream_lines(cmd, self.scan_timeout):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    data = json.loads(line)
+                    
+                    # Only process lines that contain secret findings (have SourceMetadata and DetectorName)
+                    if 'SourceMetadata' in data and 'DetectorName' in data:
+                        source_metadata = data.get('SourceMetadata', {})
+                        github_data = source_metadata.get('Data', {}).get('Github', {})
+                        
+                        secrets.append({
+                            'tool': 'trufflehog_github_org',
+                            'file': github_data.get('file', ''),
+                            'line': github_data.get('line', ''),
+                            'commit': github_data.get('commit', ''),
+                            'secret': data.get('Raw', ''),
+                            'reason': data.get('DetectorName', ''),
+                            'repo': github_data.get('repository', ''),
+                            'org': org_name,
+                            'link': github_data.get('link', ''),
+                            'timestamp': github_data.get('timestamp', ''),
+                            'email': github_data.get('email', ''),
+                            'detector_description': data.get('DetectorDescription', ''),
+                            'verified': data.get('Verified', False),
+                            'redacted': data.get('Redacted', '')
+                        })
+                    
+                except json.JSONDecodeError as e:
+                    # Skip log messages and other non-JSON lines
+                    if not line.startswith('{"level":'):
+                        self.logger.debug(f'[{self.target}] Failed to parse JSON line: {line[:100]}... Error: {e}')
+                    continue
             
             self.logger.success(f'[{self.target}] TruffleHog GitHub org scan found {len(secrets)} secrets in {org_name}')
             
@@ -781,13 +878,102 @@ class GitHubRecon:
 
     def clone_and_analyze_repo(self, repo: Dict) -> Dict:
         """Clone and analyze a single repository with all scanning tools"""
-        repo_name = repo['name']
-        clone_url = repo['clone_url']
-        
-        # Clone repository
-        repo_path = self.clone_repository(clone_url, repo_name)
+        repo_path = self.clone_repository(repo['clone_url'], repo['name'])
         if not repo_path:
-            return {'repo': repo_name, 'status': 'clone_failed'}
+            return {'repo': repo['name'], 'status': 'clone_failed'}
+        return self.analyze_repo(repo, repo_path)
+
+    def get_remote_head(self, repo_url: str) -> Optional[str]:
+        """Resolve the default branch HEAD of a remote with git ls-remote (no API budget, no clone)"""
+        try:
+            env = {**os.environ, 'GIT_TERMINAL_PROMPT': '0'}
+            result = subprocess.run(['git', 'ls-remote', repo_url, 'HEAD'], capture_output=True, text=True, timeout=30, env=env)
+            if result.returncode == 0 and result.stdout:
+                return result.stdout.split()[0]
+        except Exception as e:
+            self.logger.debug(f'[{self.target}] Could not resolve HEAD of {repo_url}: {e}')
+        return None
+
+    def prune_scan_cache(self):
+        """Remove cached repository analyses older than scan_cache_ttl"""
+        cutoff = time.time() - self.scan_cache_ttl
+        for cache_file in self.cache_dir.glob('scan-*.json'):
+            try:
+                if cache_file.stat().st_mtime < cutoff:
+                    cache_file.unlink()
+            except OSError:
+                continue
+
+    def clone_repo_stage(self, repo: Dict, scan_queue: queue.Queue) -> Optional[Dict]:
+        """
+        Clone stage of the analysis pipeline. Returns the cached analysis when the
+        repository's HEAD commit was already analyzed; otherwise clones it and hands
+        the checkout to the analysis stage through scan_queue, blocking while it is
+        full, which caps the number of checkouts on disk.
+        """
+        scan_cache_file = None
+        commit_sha = self.get_remote_head(repo['clone_url'])
+        if commit_sha:
+            scan_cache_file = self.cache_dir / f"scan-{repo['name'].replace('/', '_')}-{commit_sha}.json"
+            if self.cache_enabled and scan_cache_file.exists():
+                try:
+                    with open(scan_cache_file, 'r') as f:
+                        cached = json.load(f)
+                    self.logger.debug(f'[{self.target}] Using cached analysis of {repo["name"]} at {commit_sha[:12]}')
+                    cached['issues_and_prs'] = self.search_issues_and_prs(repo['name'])
+                    return cached
+                except (OSError, json.JSONDecodeError):
+                    pass
+        
+        repo_path = self.clone_repository(repo['clone_url'], repo['name'])
+        if repo_path:
+            scan_queue.put((repo, repo_path, scan_cache_file))
+        return None
+
+    def _analyze_worker(self, scan_queue: queue.Queue, results_lock: threading.Lock):
+        """Consume checkouts from the clone stage until a None sentinel arrives"""
+        while True:
+            job = scan_queue.get()
+            try:
+                if job is None:
+                    return
+                repo, repo_path, scan_cache_file = job
+                result = self.analyze_repo(repo, repo_path)
+                # Only a complete scan may stand in for this commit on later runs. Issues and
+                # PRs change without new commits, so they are fetched fresh rather than cached.
+                if self.cache_enabled and scan_cache_file and result['status'] == 'completed':
+                    try:
+                        with open(scan_cache_file, 'w') as f:
+                            json.dump({k: v for k, v in result.items() if k != 'issues_and_prs'}, f)
+                    except (OSError, TypeError) as e:
+                        self.logger.debug(f'[{self.target}] Could not cache analysis of {repo["name"]}: {e}')
+                with results_lock:
+                    self._record_analysis(result)
+            except Exception as e:
+                self.logger.error(f'[{self.target}] Analysis failed for {job[0]["name"]}: {e}')
+            finally:
+                scan_queue.task_done()
+
+    def _record_analysis(self, result: Dict):
+        """Merge one repository's analysis into the run results"""
+        # Add secrets to global list
+        if result['secrets']:
+            self.secrets_found.extend(result['secrets'])
+        
+        # Add useful data
+        useful_data = {
+            'repository': result['repo'],
+            'content_analysis': result['content_analysis'],
+            'commit_history': result['commit_history'],
+            'issues_and_prs': result['issues_and_prs']
+        }
+        self.useful_data.append(useful_data)
+        
+        self.logger.success(f'[{self.target}] Completed analysis of {result["repo"]}')
+
+    def analyze_repo(self, repo: Dict, repo_path: Path) -> Dict:
+        """Analysis stage: run every scanner over a cloned repository, then remove the checkout"""
+        repo_name = repo['name']
         
         results = {
             'repo': repo_name,
@@ -799,7 +985,7 @@ class GitHubRecon:
         }
         
         # Run all scans concurrently
-        with ThreadPoolExecutor(max_workers=4) as executor:
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_scans) as executor:
             # Submit all scanning tasks
             future_trufflehog = executor.submit(self.scan_with_trufflehog, repo_path)
             future_gitleaks = executor.submit(self.scan_with_gitleaks, repo_path)
@@ -814,6 +1000,7 @@ class GitHubRecon:
                 if trufflehog_secrets:
                     results['secrets'].extend(trufflehog_secrets)
             except Exception as e:
+                results['status'] = 'incomplete'
                 self.logger.error(f'[{self.target}] TruffleHog scan failed for {repo_name}: {e}')
             
             try:
@@ -821,6 +1008,7 @@ class GitHubRecon:
                 if gitleaks_secrets:
                     results['secrets'].extend(gitleaks_secrets)
             except Exception as e:
+                results['status'] = 'incomplete'
                 self.logger.error(f'[{self.target}] GitLeaks scan failed for {repo_name}: {e}')
             
             try:
@@ -828,6 +1016,7 @@ class GitHubRecon:
                 if custom_secrets:
                     results['secrets'].extend(custom_secrets)
             except Exception as e:
+                results['status'] = 'incomplete'
                 self.logger.error(f'[{self.target}] Custom scan failed for {repo_name}: {e}')
             
             try:
@@ -886,43 +1075,51 @@ class GitHubRecon:
             self.secrets_found.extend(github_org_secrets)
         
         # Clone and analyze repositories with threading
-        top_repos = sorted(repositories, key=lambda x: x.get('stars', 0), reverse=True)[:self.max_repos_to_scan]
+        # Skip repositories too large to clone and scan in reasonable time (API size is in KB)
+        scannable = [repo for repo in repositories if not self.max_repo_size_kb or repo.get('size', 0) <= self.max_repo_size_kb]
+        if len(scannable) < len(repositories):
+            self.logger.info(f'[{self.target}] Skipping {len(repositories) - len(scannable)} repositories larger than {self.max_repo_size_kb} KB')
+        top_repos = sorted(scannable, key=lambda x: x.get('stars', 0), reverse=True)[:self.max_repos_to_scan]
         
         if top_repos:
             self.logger.info(f'[{self.target}] Analyzing {len(top_repos)} repositories with threading...')
             
-            # Use ThreadPoolExecutor for concurrent repository processing
-            max_workers = min(3, len(top_repos))  # Limit concurrent repos to avoid rate limits
+            # Expire analyses cached by earlier runs
+            self.prune_scan_cache()
+            
+            # Clone and analyze as a two-stage pipeline: clone workers (network-bound)
+            # feed a bounded queue drained by analysis workers (subprocess/CPU-bound),
+            # so cloning the next repositories overlaps with scanning the current ones
+            scan_queue = queue.Queue(maxsize=self.scan_queue_size)
+            results_lock = threading.Lock()
+            scan_threads = [
+                threading.Thread(target=self._analyze_worker, args=(scan_queue, results_lock), daemon=True)
+                for _ in range(min(self.scan_workers, len(top_repos)))
+            ]
+            for thread in scan_threads:
+                thread.start()
+            
+            max_workers = min(self.max_concurrent_repos, len(top_repos))  # Limit concurrent clones to avoid rate limits
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Submit all repository analysis tasks
                 future_to_repo = {
-                    executor.submit(self.clone_and_analyze_repo, repo): repo['name']
+                    executor.submit(self.clone_repo_stage, repo, scan_queue): repo['name']
                     for repo in top_repos
                 }
-                
-                # Process results as they complete
                 for future in as_completed(future_to_repo):
-                    repo_name = future_to_repo[future]
                     try:
-                        result = future.result()
-                        
-                        # Add secrets to global list
-                        if result['secrets']:
-                            self.secrets_found.extend(result['secrets'])
-                        
-                        # Add useful data
-                        useful_data = {
-                            'repository': result['repo'],
-                            'content_analysis': result['content_analysis'],
-                            'commit_history': result['commit_history'],
-                            'issues_and_prs': result['issues_and_prs']
-                        }
-                        self.useful_data.append(useful_data)
-                        
-                        self.logger.success(f'[{self.target}] Completed analysis of {repo_name}')
-                        
+                        cached = future.result()
+                        if cached:
+                            with results_lock:
+                                self._record_analysis(cached)
                     except Exception as e:
-                        self.logger.error(f'[{self.target}] Analysis failed for {repo_name}: {e}')
+                        self.logger.error(f'[{self.target}] Cloning failed for {future_to_repo[future]}: {e}')
+            
+            for _ in scan_threads:
+                scan_queue.put(None)
+            for thread in scan_threads:
+                thread.join()
+        
+        self.session.close()
         
         # Save all results
         self.save_results()
@@ -14,15 +14,87 @@ import hashlib
 import pickle
 from pathlib import Path
 from urllib.parse import urlparse, quote
-from typing import List, Dict, Set, Optional, Tuple, Any
+from typing import Iterator, List, Dict, Set, Optional, Tuple, Any
 import re
+import queue
+import threading
 from datetime import datetime, timedelta
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import base64
 
 from common.logger import Logger
-from common.utils import ensure_dir
+from common.utils import ensure_dir, stream_lines
+
+class GitLabRateLimiter:
+    """
+    Token bucket fed by GitLab's RateLimit-* response headers.
+    Requests go out back-to-back while plenty of quota remains; once the
+    remaining budget drops below the number of concurrent workers, the
+    rest of the window is spread evenly across the remaining requests.
+    """
+    def __init__(self, workers: int = 1, default_wait: int = 60):
+        self.condition = threading.Condition()
+        self.workers = max(workers, 1)
+        self.default_wait = default_wait
+        self.remaining: Optional[int] = None  # Unknown until the first response
+        self.reset_at = 0.0
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        with self.condition:
+            while self.remaining is not None and self.remaining <= 0:
+                wait_time = self.reset_at - time.time()
+                if wait_time <= 0:
+                    break
+                self.condition.wait(wait_time)
+            
+            now = time.time()
+            if self.remaining is not None and now >= self.reset_at:
+                # The window has rolled over; the next response will tell us the new budget
+                self.remaining = None
+            
+            delay = 0.0
+            if self.remaining is not None:
+                if self.remaining < self.workers:
+                    delay = (self.reset_at - now) / max(self.remaining, 1)
+                self.remaining -= 1
+        
+        if delay > 0:
+            time.sleep(delay)
+
+    def update(self, headers):
+        """Refresh the bucket from RateLimit-Remaining / RateLimit-Reset headers"""
+        remaining = headers.get('RateLimit-Remaining')
+        reset = headers.get('RateLimit-Reset')
+        if remaining is None or not remaining.isdigit():
+            return
+        with self.condition:
+            self.remaining = int(remaining)
+            if reset is not None and reset.isdigit():
+                self.reset_at = float(reset)
+            self.condition.notify_all()
+
+    def backoff(self, retry_after: Optional[str] = None):
+        """Empty the bucket after a 429 until Retry-After (or the default wait) elapses"""
+        wait_time = int(retry_after) if retry_after and retry_after.isdigit() else self.default_wait
+        with self.condition:
+            self.remaining = 0
+            self.reset_at = max(self.reset_at, time.time() + wait_time)
+            self.condition.notify_all()
+
+# Single round trip per page: project fields and pagination cursor together
+PROJECT_SEARCH_QUERY = """
+query($search: String!, $first: Int!, $after: String) {
+  projects(search: $search, first: $first, after: $after) {
+    pageInfo { endCursor hasNextPage }
+    nodes { id name fullPath httpUrlToRepo webUrl description }
+  }
+}
+"""
 
 class GitLabRecon:
     def __init__(self, target: str, output_dir: Path, logger: Logger, config: Dict):
@@ -41,13 +113,43 @@ class GitLabRecon:
         gitlab_config = config.get('gitlab_scanner', {})
         self.gitlab_token = os.getenv(gitlab_config.get('api_token_env', 'GITLAB_TOKEN'))
         self.gitlab_api_base = "https://gitlab.com/api/v4"
+        self.gitlab_graphql_url = "https://gitlab.com/api/graphql"
+        
+        # Shared keep-alive session so API calls reuse pooled TCP/TLS connections
+        self.session = requests.Session()
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=frozenset(['GET', 'POST']),  # GraphQL queries are read-only POSTs
+            raise_on_status=False  # 429 is handled in-band by the rate limiter
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': 'MJSRecon/1.0',
+            'Content-Type': 'application/json'
+        })
+        if self.gitlab_token:
+            self.session.headers['Authorization'] = f'Bearer {self.gitlab_token}'
+        
+        # Concurrency configuration
+        self.search_workers = gitlab_config.get('search_workers', 4)
+        self.clone_workers = gitlab_config.get('clone_workers', 4)
+        self.scan_workers = gitlab_config.get('scan_workers', 2)
+        self.scan_queue_size = gitlab_config.get('scan_queue_size', 4)
         
-        # Rate limiting
-        self.rate_limit_remaining = 1000
-        self.rate_limit_reset = 0
+        # Rate limiting, paced from the RateLimit-* headers of every response
         self.rate_limit_wait = gitlab_config.get('rate_limit_wait', 60)
+        self.graphql_limiter = GitLabRateLimiter(workers=self.search_workers, default_wait=self.rate_limit_wait)
+        
+        # API response caching
+        self.cache_enabled = gitlab_config.get('cache_enabled', True)
+        self.cache_ttl = gitlab_config.get('cache_ttl', 86400)
         
         # Results storage
+        self._seen_project_ids: Set[int] = set()
         self.repositories = []
         self.secrets_found = []
         self.useful_data = []
@@ -65,6 +167,8 @@ class GitLabRecon:
         # Search configuration
         self.max_repos_to_scan = gitlab_config.get('max_repos_to_scan', 4)
         self.max_file_size_mb = gitlab_config.get('max_file_size_mb', 10)
+        self.clone_timeout = gitlab_config.get('clone_timeout', 300)
+        self.sparse_exclude = gitlab_config.get('sparse_exclude', [])
         self.search_per_page = gitlab_config.get('search_per_page', 100)
         self.max_search_results = gitlab_config.get('max_search_results', 1000)
         
@@ -80,295 +184,573 @@ class GitLabRecon:
             f'"{target}" language:java',
         ]
 
-    def search_gitlab(self, query: str, page: int = 1) -> Dict:
-        """Search GitLab repositories"""
+    def _cache_key(self, endpoint: str, params: Dict) -> str:
+        """Build a stable cache key from an endpoint and its parameters"""
+        payload = json.dumps({'endpoint': endpoint, 'params': params}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _get_cached_response(self, key: str) -> Optional[Dict]:
+        """Get cached API response if available and not expired"""
+        if not self.cache_enabled:
+            return None
+        
+        cache_file = self.cache_dir / f"{key}.pkl"
+        if cache_file.exists():
+            try:
+                with open(cache_file, 'rb') as f:
+                    cached_data = pickle.load(f)
+                if time.time() - cached_data['timestamp'] < self.cache_ttl:
+                    return cached_data['data']
+            except Exception:
+                pass
+        return None
+
+    def _cache_response(self, key: str, data: Dict):
+        """Cache API response"""
+        if not self.cache_enabled:
+            return
+        
+        cache_file = self.cache_dir / f"{key}.pkl"
+        try:
+            with open(cache_file, 'wb') as f:
+                pickle.dump({'data': data, 'timestamp': time.time()}, f)
+        except Exception:
+            pass
+
+    def _graphql(self, query: str, variables: Dict, retries: int = 1) -> Dict:
+        """Execute a GitLab GraphQL query and return its data payload"""
         if not self.gitlab_token:
-            self.logger.warning("No GitLab token provided. Skipping GitLab search.")
             return {}
         
-        headers = {
-            'Authorization': f'Bearer {self.gitlab_token}',
-            'Content-Type': 'application/json'
-        }
-        
-        params = {
-            'search': query,
-            'scope': 'projects',
-            'per_page': self.search_per_page,
-            'page': page
-        }
+        cache_key = self._cache_key(self.gitlab_graphql_url, {'query': query, 'variables': variables})
+        cached_data = self._get_cached_response(cache_key)
+        if cached_data is not None:
+            return cached_data
         
         try:
-            response = requests.get(
-                f"{self.gitlab_api_base}/search",
-                headers=headers,
-                params=params,
+            self.graphql_limiter.acquire()
+            response = self.session.post(
+                self.gitlab_graphql_url,
+                json={'query': query, 'variables': variables},
                 timeout=30
             )
+            self.graphql_limiter.update(response.headers)
             
             if response.status_code == 200:
-                return response.json()
+                payload = response.json()
+                if payload.get('errors'):
+                    self.logger.error(f"GitLab GraphQL error: {payload['errors']}")
+                    return payload.get('data') or {}
+                data = payload.get('data') or {}
+                self._cache_response(cache_key, data)
+                return data
             elif response.status_code == 429:
                 self.logger.warning("Rate limited by GitLab API. Waiting...")
-                time.sleep(self.rate_limit_wait)
+                self.graphql_limiter.backoff(response.headers.get('Retry-After'))
+                if retries > 0:
+                    return self._graphql(query, variables, retries - 1)
                 return {}
             else:
                 self.logger.error(f"GitLab API error: {response.status_code}")
                 return {}
                 
         except Exception as e:
-            self.logger.error(f"Error searching GitLab: {e}")
+            self.logger.error(f"Error querying GitLab GraphQL API: {e}")
             return {}
 
-    def get_project_details(self, project_id: int) -> Dict:
-        """Get detailed information about a GitLab project"""
+    def search_gitlab(self, query: str, after: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Search GitLab projects, returning one page of project details and the
+        cursor for the next page (None when there are no more pages).
+        """
         if not self.gitlab_token:
-            return {}
+            self.logger.warning("No GitLab token provided. Skipping GitLab search.")
+            return [], None
         
-        headers = {
-            'Authorization': f'Bearer {self.gitlab_token}',
-            'Content-Type': 'application/json'
+        variables = {
+            'search': query,
+            'first': min(self.search_per_page, 100),
+            'after': after
         }
-        
-        try:
-            response = requests.get(
-                f"{self.gitlab_api_base}/projects/{project_id}",
-                headers=headers,
-                timeout=30
-            )
+        data = self._graphql(PROJECT_SEARCH_QUERY, variables)
+        result = data.get('projects') or {}
+        
+        projects = []
+        for node in result.get('nodes') or []:
+            # GraphQL ids are global ids ("gid://gitlab/Project/123"), keep the numeric part
+            project_id = node.get('id', '').rsplit('/', 1)[-1]
+            projects.append({
+                'id': int(project_id) if project_id.isdigit() else node.get('id'),
+                'name': node.get('name', ''),
+                'path_with_namespace': node.get('fullPath', ''),
+                'http_url_to_repo': node.get('httpUrlToRepo', ''),
+                'web_url': node.get('webUrl', ''),
+                'description': node.get('description', ''),
+            })
+        
+        page_info = result.get('pageInfo') or {}
+        next_cursor = page_info.get('endCursor') if page_info.get('hasNextPage') else None
+        return projects, next_cursor
+
+    def search_all_pages(self, query: str) -> List[Dict]:
+        """Follow the pagination cursor of a search query up to max_search_results"""
+        self.logger.info(f"Searching GitLab with query: {query}")
+        
+        results = []
+        cursor = None
+        while len(results) < self.max_search_results:
+            projects, cursor = self.search_gitlab(query, cursor)
+            results.extend(projects)
             
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {}
-                
-        except Exception as e:
-            self.logger.error(f"Error getting project details: {e}")
-            return {}
+            if not cursor:
+                break
+        
+        return results
 
     def clone_repository(self, repo_url: str, repo_name: str) -> Optional[Path]:
         """Clone a GitLab repository"""
         try:
             clone_dir = self.cache_dir / repo_name
-            if clone_dir.exists():
+            if (clone_dir / '.git').is_dir():
+                if self.update_repository(clone_dir, repo_name):
+                    return clone_dir
+                shutil.rmtree(clone_dir, ignore_errors=True)
+            elif clone_dir.exists():
                 shutil.rmtree(clone_dir)
             
-            # Clone with depth 1 for faster cloning
-            cmd = ['git', 'clone', '--depth', '1', repo_url, str(clone_dir)]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            # Partial shallow clone: only HEAD, blobs fetched on demand at checkout
+            cmd = ['git', 'clone', '--filter=blob:none', '--depth', '1', '--no-checkout', repo_url, str(clone_dir)]
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.clone_timeout)
+            
+            if result.returncode != 0:
+                self.logger.error(f"Failed to clone {repo_name}: {result.stderr}")
+                return None
+            
+            # Sparse checkout so binary assets never get downloaded or written to disk
+            if self.sparse_exclude:
+                cmd = ['git', '-C', str(clone_dir), 'sparse-checkout', 'set', '--no-cone', '/*']
+                cmd += [f'!{pattern}' for pattern in self.sparse_exclude]
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+                if result.returncode != 0:
+                    self.logger.debug(f"Sparse checkout unavailable for {repo_name}, checking out everything: {result.stderr}")
+            
+            cmd = ['git', '-C', str(clone_dir), 'checkout']
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.clone_timeout)
             
             if result.returncode == 0:
                 self.logger.debug(f"Successfully cloned {repo_name}")
                 return clone_dir
             else:
-                self.logger.error(f"Failed to clone {repo_name}: {result.stderr}")
+                self.logger.error(f"Failed to check out {repo_name}: {result.stderr}")
                 return None
                 
         except Exception as e:
             self.logger.error(f"Error cloning {repo_name}: {e}")
             return None
 
-    def scan_repository(self, repo_path: Path, repo_name: str) -> List[Dict]:
-        """Scan a repository for secrets"""
-        secrets = []
-        
+    def update_repository(self, clone_dir: Path, repo_name: str) -> bool:
+        """Bring an existing checkout up to date, transferring only new objects"""
         try:
-            # Use configured tools for scanning
-            if self.tools.get('trufflehog', False):
-                truffle_secrets = self.run_trufflehog(repo_path, repo_name)
-                secrets.extend(truffle_secrets)
-            
-            if self.tools.get('gitleaks', False):
-                gitleaks_secrets = self.run_gitleaks(repo_path, repo_name)
-                secrets.extend(gitleaks_secrets)
-            
-            if self.tools.get('custom_patterns', False):
-                custom_secrets = self.run_custom_patterns(repo_path, repo_name)
-                secrets.extend(custom_secrets)
+            for cmd in (
+                ['git', '-C', str(clone_dir), 'fetch', '--filter=blob:none', '--depth', '1', 'origin'],
+                ['git', '-C', str(clone_dir), 'reset', '--hard', 'FETCH_HEAD'],
+            ):
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.clone_timeout)
+                if result.returncode != 0:
+                    self.logger.debug(f"Could not update {repo_name}, re-cloning: {result.stderr}")
+                    return False
             
+            # Mark the checkout as recently used so cache pruning keeps it
+            os.utime(clone_dir)
+            self.logger.debug(f"Updated existing clone of {repo_name}")
+            return True
         except Exception as e:
-            self.logger.error(f"Error scanning {repo_name}: {e}")
+            self.logger.debug(f"Could not update {repo_name}, re-cloning: {e}")
+            return False
+
+    def prune_cache(self):
+        """Remove cached API responses, scan results and checkouts older than cache_ttl"""
+        cutoff = time.time() - self.cache_ttl
+        for entry in self.cache_dir.iterdir():
+            try:
+                if entry.stat().st_mtime >= cutoff:
+                    continue
+                if entry.is_dir():
+                    shutil.rmtree(entry, ignore_errors=True)
+                else:
+                    entry.unlink()
+            except OSError:
+                continue
+
+    def get_head_commit(self, repo_path: Path) -> Optional[str]:
+        """Return the commit SHA checked out in a cloned repository"""
+        try:
+            result = subprocess.run(['git', '-C', str(repo_path), 'rev-parse', 'HEAD'], capture_output=True, text=True, timeout=30)
+            if result.returncode == 0:
+                return result.stdout.strip()
+        except Exception as e:
+            self.logger.debug(f"Could not resolve HEAD of {repo_path}: {e}")
+        return None
+
+    def scan_repository(self, repo_path: Path, repo_name: str) -> Tuple[List[Dict], bool]:
+        """
+        Scan a repository for secrets. The enabled scanners run side by side so
+        their tree walks overlap and share a warm page cache instead of each
+        re-reading the checkout from disk in turn. Returns the findings and
+        whether every scanner completed; a failed scanner contributes nothing.
+        """
+        secrets = []
+        complete = True
+        
+        # Use configured tools for scanning
+        scanners = [
+            (tool_name, scanner)
+            for tool_name, scanner in (
+                ('trufflehog', self.run_trufflehog),
+                ('gitleaks', self.run_gitleaks),
+                ('custom_patterns', self.run_custom_patterns),
+            )
+            if self.tools.get(tool_name, False)
+        ]
+        if not scanners:
+            return secrets, complete
         
-        return secrets
+        with ThreadPoolExecutor(max_workers=len(scanners)) as executor:
+            futures = [(tool_name, executor.submit(scanner, repo_path, repo_name)) for tool_name, scanner in scanners]
+            for tool_name, future in futures:
+                try:
+                    secrets.extend(future.result())
+                except Exception:
+                    # The scanner has already logged why it failed
+                    complete = False
+        
+        return secrets, complete
 
     def run_trufflehog(self, repo_path: Path, repo_name: str) -> List[Dict]:
-        """Run TruffleHog on repository"""
+        """Run TruffleHog on repository, parsing its NDJSON output as it streams"""
         secrets = []
         
         try:
             cmd = ['trufflehog', '--json', str(repo_path)]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
-            
-            if result.returncode == 0 and result.stdout:
-                for line in result.stdout.strip().split('\n'):
-                    if line:
-                        try:
-                            data = json.loads(line)
-                            secrets.append({
-                                'tool': 'trufflehog',
-                                'repository': repo_name,
-                                'file': data.get('path', ''),
-                                'line': data.get('line', ''),
-                                'secret': data.get('raw', ''),
-                                'type': data.get('detectorName', ''),
-                                'confidence': 'high'
-                            })
-                        except json.JSONDecodeError:
-                            continue
+            for line in stream_lines(cmd, 600):
+                if not line.strip():
+                    continue
+                try:
+                    data = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+                secrets.append({
+                    'tool': 'trufflehog',
+                    'repository': repo_name,
+                    'file': data.get('path', ''),
+                    'line': data.get('line', ''),
+                    'secret': data.get('raw', ''),
+                    'type': data.get('detectorName', ''),
+                    'confidence': 'high'
+                })
                             
+        except subprocess.TimeoutExpired:
+            self.logger.error(f"TruffleHog timed out on {repo_name}")
+            raise
+        except subprocess.CalledProcessError as e:
+            self.logger.error(f"TruffleHog exited with code {e.returncode} on {repo_name}: {e.stderr.strip()}")
+            raise
         except Exception as e:
             self.logger.error(f"Error running TruffleHog on {repo_name}: {e}")
+            raise
         
         return secrets
 
     def run_gitleaks(self, repo_path: Path, repo_name: str) -> List[Dict]:
         """Run Gitleaks on repository"""
         secrets = []
+        report_file = None
         
         try:
-            cmd = ['gitleaks', 'detect', '--source', str(repo_path), '--format', 'json']
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+            # Gitleaks writes its report to a file; stdout only carries log noise
+            with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+                report_file = Path(f.name)
             
-            if result.returncode == 0 and result.stdout:
+            cmd = [
+                'gitleaks', 'detect', '--source', str(repo_path),
+                '--report-format', 'json', '--report-path', str(report_file),
+                '--no-banner', '--exit-code', '0'
+            ]
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=600)
+            
+            if result.returncode == 0 and report_file.stat().st_size > 0:
                 try:
-                    data = json.loads(result.stdout)
-                    for finding in data:
-                        secrets.append({
-                            'tool': 'gitleaks',
-                            'repository': repo_name,
-                            'file': finding.get('File', ''),
-                            'line': finding.get('Line', ''),
-                            'secret': finding.get('Secret', ''),
-                            'type': finding.get('RuleID', ''),
-                            'confidence': 'high'
-                        })
-                except json.JSONDecodeError:
-                    pass
+                    findings = orjson.loads(report_file.read_bytes())
+                except orjson.JSONDecodeError:
+                    findings = []
+                secrets.extend(
+                    {
+                        'tool': 'gitleaks',
+                        'repository': repo_name,
+                        'file': finding.get('File', ''),
+                        'line': finding.get('StartLine', finding.get('Line', '')),
+                        'secret': finding.get('Secret', ''),
+                        'type': finding.get('RuleID', ''),
+                        'confidence': 'high'
+                    }
+                    for finding in findings
+                )
+            elif result.returncode != 0:
+                # --exit-code 0 is passed, so any other code is a real failure
+                raise subprocess.CalledProcessError(result.returncode, cmd, stderr=result.stderr)
                     
+        except subprocess.TimeoutExpired:
+            self.logger.error(f"Gitleaks timed out on {repo_name}")
+            raise
+        except subprocess.CalledProcessError as e:
+            self.logger.error(f"Gitleaks exited with code {e.returncode} on {repo_name}: {e.stderr.strip()}")
+            raise
         except Exception as e:
             self.logger.error(f"Error running Gitleaks on {repo_name}: {e}")
+            raise
+        finally:
+            if report_file and report_file.exists():
+                report_file.unlink()
         
         return secrets
 
     def run_custom_patterns(self, repo_path: Path, repo_name: str) -> List[Dict]:
-        """Run custom pattern matching"""
+        """Run custom pattern matching with a single ripgrep pass over the repository"""
         secrets = []
         
+        # Get custom patterns from config
+        patterns = self.config.get('gitlab_scanner', {}).get('secret_patterns', {})
+        compiled = [
+            (pattern_name, re.compile(pattern))
+            for pattern_name, pattern_list in patterns.items()
+            for pattern in pattern_list
+        ]
+        if not compiled:
+            return secrets
+        
+        patterns_file = None
         try:
-            # Get custom patterns from config
-            patterns = self.config.get('gitlab_scanner', {}).get('secret_patterns', {})
+            # All patterns go to one file so the tree is walked once, not once per pattern
+            with tempfile.NamedTemporaryFile('w', suffix='.patterns', delete=False) as f:
+                f.write('\n'.join(regex.pattern for _, regex in compiled) + '\n')
+                patterns_file = f.name
             
-            for pattern_name, pattern_list in patterns.items():
-                for pattern in pattern_list:
-                    # Search for patterns in files
-                    cmd = ['grep', '-r', '-n', pattern, str(repo_path)]
-                    result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-                    
-                    if result.stdout:
-                        for line in result.stdout.strip().split('\n'):
-                            if line:
-                                parts = line.split(':', 2)
-                                if len(parts) >= 3:
-                                    file_path, line_num, content = parts[0], parts[1], parts[2]
-                                    secrets.append({
-                                        'tool': 'custom_patterns',
-                                        'repository': repo_name,
-                                        'file': file_path,
-                                        'line': line_num,
-                                        'secret': content.strip(),
-                                        'type': pattern_name,
-                                        'confidence': 'medium'
-                                    })
+            if shutil.which('rg'):
+                cmd = [
+                    'rg', '--json', '--hidden', '--no-ignore',
+                    '--glob', '!.git', '--max-filesize', f'{self.max_file_size_mb}M',
+                    '-f', patterns_file, str(repo_path)
+                ]
+                matches = self._iter_ripgrep_matches(cmd)
+            else:
+                cmd = ['grep', '-r', '-n', '-E', '-I', '--exclude-dir=.git', '-f', patterns_file, str(repo_path)]
+                matches = self._iter_grep_matches(cmd)
+            
+            for file_path, line_num, content in matches:
+                # Attribute the matching line back to the pattern(s) that produced it
+                for pattern_name, regex in compiled:
+                    if regex.search(content):
+                        secrets.append({
+                            'tool': 'custom_patterns',
+                            'repository': repo_name,
+                            'file': file_path,
+                            'line': line_num,
+                            'secret': content.strip(),
+                            'type': pattern_name,
+                            'confidence': 'medium'
+                        })
                                     
+        except subprocess.TimeoutExpired:
+            self.logger.error(f"Custom pattern scan timed out on {repo_name}")
+            raise
+        except subprocess.CalledProcessError as e:
+            # rg and grep exit 2 on errors such as unreadable files or a bad pattern
+            self.logger.error(f"{e.cmd[0]} exited with code {e.returncode} on {repo_name}: {e.stderr.strip()}")
+            raise
         except Exception as e:
             self.logger.error(f"Error running custom patterns on {repo_name}: {e}")
+            raise
+        finally:
+            if patterns_file:
+                os.unlink(patterns_file)
         
         return secrets
 
+    def _iter_ripgrep_matches(self, cmd: List[str]) -> Iterator[Tuple[str, str, str]]:
+        """Yield (file, line number, line) tuples from streamed `rg --json` output"""
+        for line in stream_lines(cmd, 300, ok_codes=(0, 1)):
+            try:
+                event = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+            if event.get('type') != 'match':
+                continue
+            data = event['data']
+            yield (
+                data['path'].get('text', ''),
+                str(data.get('line_number', '')),
+                data['lines'].get('text', '')
+            )
+
+    def _iter_grep_matches(self, cmd: List[str]) -> Iterator[Tuple[str, str, str]]:
+        """Yield (file, line number, line) tuples from streamed `grep -n` output"""
+        for line in stream_lines(cmd, 300, ok_codes=(0, 1), errors='ignore'):
+            parts = line.rstrip('\n').split(':', 2)
+            if len(parts) >= 3:
+                yield parts[0], parts[1], parts[2]
+
+    def clone_project(self, project: Dict, scan_queue: queue.Queue) -> List[Dict]:
+        """
+        Clone stage of the scan pipeline. Hands the checkout to the scan stage
+        through scan_queue (blocking while it is full, which caps the number of
+        checkouts on disk), or returns cached results when this commit was
+        already scanned.
+        """
+        repo_name = project.get('path_with_namespace', project.get('name', 'unknown')).replace('/', '_')
+        repo_url = project.get('http_url_to_repo', '')
+        
+        if not repo_url:
+            return []
+        
+        self.logger.info(f"Cloning repository: {repo_name}")
+        
+        # Clone repository
+        repo_path = self.clone_repository(repo_url, repo_name)
+        if not repo_path:
+            return []
+        
+        # Reuse the previous scan of this exact commit if there is one
+        scan_cache_file = None
+        commit_sha = self.get_head_commit(repo_path)
+        if commit_sha:
+            scan_cache_file = self.cache_dir / f"scan-{project.get('id')}-{commit_sha}.json"
+            if self.cache_enabled and scan_cache_file.exists():
+                try:
+                    secrets = orjson.loads(scan_cache_file.read_bytes())
+                    self.logger.debug(f"Using cached scan results for {repo_name} at {commit_sha[:12]}")
+                    return secrets
+                except orjson.JSONDecodeError:
+                    pass
+        
+        scan_queue.put((repo_name, repo_path, scan_cache_file))
+        return []
+
+    def scan_project(self, repo_name: str, repo_path: Path, scan_cache_file: Optional[Path]) -> List[Dict]:
+        """
+        Scan stage of the scan pipeline: scan a checkout and cache the results.
+        Nothing is cached when a scanner failed, so the next run scans again.
+        """
+        self.logger.info(f"Scanning repository: {repo_name}")
+        
+        # Scan for secrets
+        secrets, complete = self.scan_repository(repo_path, repo_name)
+        
+        if self.cache_enabled and scan_cache_file and complete:
+            try:
+                scan_cache_file.write_bytes(orjson.dumps(secrets))
+            except OSError as e:
+                self.logger.debug(f"Could not cache scan results for {repo_name}: {e}")
+        
+        # The checkout is kept for the next run to update in place; prune_cache() expires it
+        return secrets
+
+    def _scan_worker(self, scan_queue: queue.Queue, results_lock: threading.Lock):
+        """Consume checkouts from the clone stage until a None sentinel arrives"""
+        while True:
+            job = scan_queue.get()
+            try:
+                if job is None:
+                    return
+                secrets = self.scan_project(*job)
+                with results_lock:
+                    self.secrets_found.extend(secrets)
+            except Exception as e:
+                self.logger.error(f"Error scanning repository {job[0]}: {e}")
+            finally:
+                scan_queue.task_done()
+
     def save_results(self):
-        """Save all results to files"""
+        """Save all results to files (serialized straight to bytes with orjson)"""
         # Save repositories
         if self.repositories:
             repos_file = self.output_dir / "repositories.json"
-            with open(repos_file, 'w') as f:
-                json.dump(self.repositories, f, indent=2)
+            with open(repos_file, 'wb') as f:
+                f.write(orjson.dumps(self.repositories, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
             self.logger.info(f"Saved {len(self.repositories)} repositories to {repos_file}")
         
         # Save secrets
         if self.secrets_found:
             secrets_file = self.output_dir / "secrets.json"
-            with open(secrets_file, 'w') as f:
-                json.dump(self.secrets_found, f, indent=2)
+            with open(secrets_file, 'wb') as f:
+                f.write(orjson.dumps(self.secrets_found, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
             self.logger.info(f"Saved {len(self.secrets_found)} secrets to {secrets_file}")
         
         # Save useful data
         if self.useful_data:
             data_file = self.output_dir / "useful_data.json"
-            with open(data_file, 'w') as f:
-                json.dump(self.useful_data, f, indent=2)
+            with open(data_file, 'wb') as f:
+                f.write(orjson.dumps(self.useful_data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
             self.logger.info(f"Saved {len(self.useful_data)} useful data items to {data_file}")
 
     def run(self):
         """Main execution method"""
         self.logger.info(f"Starting GitLab reconnaissance for target: {self.target}")
         
-        # Search for repositories
-        all_projects = []
-        
-        for query in self.search_queries:
-            self.logger.info(f"Searching GitLab with query: {query}")
-            
-            page = 1
-            while page <= (self.max_search_results // self.search_per_page):
-                results = self.search_gitlab(query, page)
-                
-                if not results:
-                    break
-                
-                for project in results:
-                    project_details = self.get_project_details(project.get('id'))
-                    if project_details:
-                        all_projects.append(project_details)
-                
-                page += 1
-                
-                # Rate limiting
-                time.sleep(1)
+        # Expire stale cache entries and checkouts left behind by earlier runs
+        self.prune_cache()
         
-        # Remove duplicates
+        # Search for repositories (details come back with the search results).
+        # Queries are paged concurrently; results are merged in query order,
+        # dropping projects already returned by an earlier query.
         unique_projects = []
-        seen_ids = set()
-        for project in all_projects:
-            if project.get('id') not in seen_ids:
-                unique_projects.append(project)
-                seen_ids.add(project.get('id'))
+        
+        queries = list(dict.fromkeys(self.search_queries))
+        with ThreadPoolExecutor(max_workers=self.search_workers) as executor:
+            for projects in executor.map(self.search_all_pages, queries):
+                for project in projects:
+                    project_id = project.get('id')
+                    if project_id in self._seen_project_ids:
+                        continue
+                    self._seen_project_ids.add(project_id)
+                    unique_projects.append(project)
         
         self.logger.info(f"Found {len(unique_projects)} unique GitLab projects")
         
         # Limit the number of repositories to scan
         projects_to_scan = unique_projects[:self.max_repos_to_scan]
         
-        # Scan repositories
-        for project in projects_to_scan:
-            repo_name = project.get('name', 'unknown')
-            repo_url = project.get('http_url_to_repo', '')
+        # Clone and scan as a two-stage pipeline: clone workers (network-bound)
+        # feed a bounded queue drained by scan workers (CPU/disk-bound), so
+        # cloning the next repositories overlaps with scanning the current ones
+        if projects_to_scan:
+            scan_queue = queue.Queue(maxsize=self.scan_queue_size)
+            results_lock = threading.Lock()
+            scan_threads = [
+                threading.Thread(target=self._scan_worker, args=(scan_queue, results_lock), daemon=True)
+                for _ in range(min(self.scan_workers, len(projects_to_scan)))
+            ]
+            for thread in scan_threads:
+                thread.start()
             
-            if not repo_url:
-                continue
-            
-            self.logger.info(f"Scanning repository: {repo_name}")
-            
-            # Clone repository
-            repo_path = self.clone_repository(repo_url, repo_name)
-            if not repo_path:
-                continue
-            
-            # Scan for secrets
-            secrets = self.scan_repository(repo_path, repo_name)
-            self.secrets_found.extend(secrets)
+            with ThreadPoolExecutor(max_workers=min(self.clone_workers, len(projects_to_scan))) as executor:
+                future_to_project = {
+                    executor.submit(self.clone_project, project, scan_queue): project.get('name', 'unknown')
+                    for project in projects_to_scan
+                }
+                for future in as_completed(future_to_project):
+                    try:
+                        cached_secrets = future.result()
+                        with results_lock:
+                            self.secrets_found.extend(cached_secrets)
+                    except Exception as e:
+                        self.logger.error(f"Error cloning repository {future_to_project[future]}: {e}")
             
-            # Clean up
-            shutil.rmtree(repo_path)
+            for _ in scan_threads:
+                scan_queue.put(None)
+            for thread in scan_threads:
+                thread.join()
+        
+        self.session.close()
         
         # Save results
         self.save_results()
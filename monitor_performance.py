@@ -9,30 +9,73 @@ import os
 import sys
 from datetime import datetime
 
+PROCESS_REFRESH_TICKS = 10     # Rescan the process table for new Python processes every N ticks
+CONNECTIONS_REFRESH_TICKS = 5  # net_connections() walks /proc/net/*, so sample it less often
+
+def refresh_python_processes(known: dict) -> dict:
+    """Add newly started Python processes to the per-PID cache, keeping existing Process objects"""
+    for proc in psutil.process_iter(['name']):
+        try:
+            if proc.pid not in known and 'python' in (proc.info['name'] or '').lower():
+                proc.cpu_percent(None)  # Prime the counter; the first reading is always 0.0
+                known[proc.pid] = proc
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return known
+
+def clear_screen():
+    """Clear the terminal without spawning a shell each refresh"""
+    if os.name == 'posix':
+        print("\033[2J\033[H", end='')
+    else:
+        os.system('cls')
+
 def monitor_performance():
     """Monitor system performance during validation"""
     print("🔍 Performance Monitor Started")
     print("=" * 50)
     
+    known_processes = {}
+    http_connection_count = None
+    psutil.cpu_percent(interval=None)  # Prime so later non-blocking calls measure since the last tick
+    tick = 0
+    
     try:
         while True:
             # Get CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = psutil.cpu_percent(interval=None)
             
             # Get memory usage
             memory = psutil.virtual_memory()
             
-            # Get Python processes
+            # Get Python processes from the cache, dropping those that have exited
+            if tick % PROCESS_REFRESH_TICKS == 0:
+                refresh_python_processes(known_processes)
             python_processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
+            for pid, proc in list(known_processes.items()):
                 try:
-                    if 'python' in proc.info['name'].lower():
-                        python_processes.append(proc.info)
+                    python_processes.append({
+                        'pid': pid,
+                        'name': proc.name(),
+                        'cpu_percent': proc.cpu_percent(None),
+                        'memory_percent': proc.memory_percent()
+                    })
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
+                    del known_processes[pid]
+            
+            # Network connections
+            if tick % CONNECTIONS_REFRESH_TICKS == 0:
+                try:
+                    connections = psutil.net_connections()
+                    http_connection_count = sum(
+                        1 for c in connections
+                        if c.status == 'ESTABLISHED' and c.raddr and c.raddr.port in [80, 443, 8080]
+                    )
+                except (psutil.AccessDenied, OSError):
+                    http_connection_count = None
             
             # Clear screen (optional)
-            os.system('clear' if os.name == 'posix' else 'cls')
+            clear_screen()
             
             # Print current time
             print(f"⏰ {datetime.now().strftime('%H:%M:%S')}")
@@ -51,17 +94,13 @@ def monitor_performance():
             else:
                 print("\n🐍 No Python processes found")
             
-            # Network connections
-            try:
-                connections = psutil.net_connections()
-                http_connections = [c for c in connections if c.status == 'ESTABLISHED' and c.raddr and c.raddr.port in [80, 443, 8080]]
-                print(f"\n🌐 Active HTTP Connections: {len(http_connections)}")
-            except:
-                pass
+            if http_connection_count is not None:
+                print(f"\n🌐 Active HTTP Connections: {http_connection_count}")
             
             print("\n" + "=" * 50)
             print("Press Ctrl+C to stop monitoring")
             
+            tick += 1
             time.sleep(2)
             
     except KeyboardInterrupt:
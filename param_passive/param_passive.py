@@ -2,10 +2,10 @@ import json
 from pathlib import Path
 from typing import Dict, Any, Set
 from tqdm import tqdm
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlsplit, parse_qsl
 
 from common.logger import Logger
-from common.utils import run_command, ensure_dir
+from common.utils import ensure_dir
 from common.finder import find_urls_with_extension
 
 def run(args: Any, config: Dict, logger: Logger, workflow_data: Dict) -> Dict:
@@ -26,21 +26,20 @@ def run(args: Any, config: Dict, logger: Logger, workflow_data: Dict) -> Dict:
     ensure_dir(param_passive_dir)
     
     # Extract important file types
-    important_extensions = config['param_passive']['important_extensions']  # Changed from passive_data
+    # A tuple lets str.endswith test every extension in a single C-level call
+    important_extensions = tuple(ext.lower() for ext in config['param_passive']['important_extensions'])  # Changed from passive_data
     important_urls = set()
     all_params = set()
     
     for url in live_urls:
-        parsed = urlparse(url)
+        parsed = urlsplit(url)
         
         # Check for important file extensions
-        if any(ext in parsed.path.lower() for ext in important_extensions):
+        if parsed.path.lower().endswith(important_extensions):
             important_urls.add(url)
         
-        # Extract parameters using unfurl
-        params = extract_parameters_with_unfurl(url, logger)
-        for param_name in params:
-            all_params.add(param_name)
+        # Extract parameter keys straight from the query string
+        all_params.update(extract_parameter_keys(parsed.query))
     
     # Save results
     if important_urls:
@@ -60,12 +59,6 @@ def run(args: Any, config: Dict, logger: Logger, workflow_data: Dict) -> Dict:
         }
     }
 
-def extract_parameters_with_unfurl(url: str, logger: Logger) -> Set[str]:
-    """Uses unfurl to extract parameter keys from a single URL."""
-    params = set()
-    exit_code, stdout, stderr = run_command(["unfurl", "keys"], input=url)
-    if exit_code == 0 and stdout:
-        params.update(stdout.splitlines())
-    elif stderr:
-        logger.debug(f"Unfurl failed for {url}: {stderr}")
-    return params
+def extract_parameter_keys(query: str) -> Set[str]:
+    """Extracts parameter keys from a URL query string (equivalent to `unfurl keys`)."""
+    return {key for key, _ in parse_qsl(query, keep_blank_values=True)}
@@ -3,87 +3,84 @@
 Script to process very large URL datasets in chunks
 """
 
-import os
 import sys
+import tempfile
 from pathlib import Path
-from typing import List, Set
+from typing import Iterable, Iterator, List
 import argparse
 
 # Add the project root to the path to import config
 sys.path.insert(0, str(Path(__file__).parent))
 from common.config import CONFIG
 from common.logger import Logger
+from common.utils import count_lines, ensure_dir, sort_unique_files
+from validation.validator import run as validation_run
 
-def split_large_file(input_file: Path, chunk_size: int = 10000) -> List[Path]:
-    """Split a large file into smaller chunks"""
-    chunk_files = []
+def iter_chunks(input_file: Path, chunk_size: int = 10000) -> Iterator[List[str]]:
+    """Yield batches of at most chunk_size non-empty lines read straight from the input file"""
+    chunk_lines = []
     
-    with open(input_file, 'r') as f:
-        chunk_num = 1
-        chunk_lines = []
-        
+    with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
         for line in f:
-            chunk_lines.append(line.strip())
+            line = line.strip()
+            if not line:
+                continue
+            chunk_lines.append(line)
             
             if len(chunk_lines) >= chunk_size:
-                # Write chunk
-                chunk_file = input_file.parent / f"{input_file.stem}_chunk_{chunk_num}.txt"
-                with open(chunk_file, 'w') as cf:
-                    cf.write('\n'.join(chunk_lines) + '\n')
-                chunk_files.append(chunk_file)
-                
-                # Reset for next chunk
+                yield chunk_lines
                 chunk_lines = []
-                chunk_num += 1
-        
-        # Write remaining lines
-        if chunk_lines:
-            chunk_file = input_file.parent / f"{input_file.stem}_chunk_{chunk_num}.txt"
-            with open(chunk_file, 'w') as cf:
-                cf.write('\n'.join(chunk_lines) + '\n')
-            chunk_files.append(chunk_file)
     
-    return chunk_files
+    # Remaining lines
+    if chunk_lines:
+        yield chunk_lines
 
-def process_chunks(chunk_files: List[Path], output_file: Path, command: str, target_output_dir: Path, logger: Logger):
+def process_chunks(chunks: Iterable[List[str]], total_chunks: int, output_file: Path, command: str, target_output_dir: Path, logger: Logger):
     """Process each chunk and combine results"""
-    all_results = set()
+    ensure_dir(target_output_dir)
     
-    for i, chunk_file in enumerate(chunk_files, 1):
-        logger.info(f"Processing chunk {i}/{len(chunk_files)}: {chunk_file}")
-        
-        # Create temporary output directory for this chunk
-        chunk_output_dir = target_output_dir / f"chunk_output_{i}"
-        chunk_output_dir.mkdir(exist_ok=True)
-        
-        # Run validation on this chunk using target output directory
-        cmd = f"python -m mjsrecon validation --independent --input {chunk_file} --output {target_output_dir}"
-        logger.info(f"Running: {cmd}")
-        
-        # Execute command and capture output
-        result = os.system(cmd)
+    # Validation runs in-process; the namespace mirrors an independent CLI run
+    args = argparse.Namespace(command=command, independent=True, input=None, output=target_output_dir)
+    
+    # Each chunk's live URLs are spilled to disk and merged with an external sort at the
+    # end, so memory stays bounded by one chunk rather than the whole result set
+    with tempfile.TemporaryDirectory(dir=target_output_dir) as spill_dir:
+        spill_files = []
         
-        if result == 0:
-            # Read results from chunk output using config file path
-            live_js_file = target_output_dir / CONFIG['files']['live_js']
-            if live_js_file.exists():
-                with open(live_js_file, 'r') as f:
-                    chunk_results = set(line.strip() for line in f if line.strip())
-                all_results.update(chunk_results)
-                logger.info(f"Added {len(chunk_results)} live URLs from chunk {i}")
+        for i, chunk in enumerate(chunks, 1):
+            logger.info(f"Processing chunk {i}/{total_chunks} ({len(chunk)} URLs)")
+            
+            workflow_data = {
+                'target': f"chunk_{i}",
+                'target_output_dir': target_output_dir,
+                'all_urls': set(chunk)
+            }
+            
+            try:
+                result = validation_run(args=args, config=CONFIG, logger=logger, workflow_data=workflow_data)
+            except Exception as e:
+                logger.error(f"Validation failed for chunk {i}: {e}")
+                continue
+            
+            chunk_results = result.get('live_urls', set())
+            if chunk_results:
+                spill_file = Path(spill_dir) / f"chunk_{i}.txt"
+                with open(spill_file, 'w', buffering=1 << 20) as f:
+                    f.writelines(f"{url}\n" for url in chunk_results)
+                spill_files.append(spill_file)
+            logger.info(f"Added {len(chunk_results)} live URLs from chunk {i}")
         
-        # Clean up chunk output
-        if chunk_output_dir.exists():
-            import shutil
-            shutil.rmtree(chunk_output_dir)
-    
-    # Save combined results using config
-    with open(output_file, 'w') as f:
-        for url in sorted(all_results):
-            f.write(f"{url}\n")
+        # Save combined results using config
+        if spill_files:
+            exit_code, _, stderr = sort_unique_files(spill_files, output_file)
+            if exit_code != 0:
+                logger.error(f"Failed to merge chunk results: {stderr}")
+                return
+        else:
+            output_file.write_text('')
     
     logger.success(f"Combined results saved to: {output_file}")
-    logger.info(f"Total live URLs found: {len(all_results)}")
+    logger.info(f"Total live URLs found: {count_lines(output_file)}")
 
 def main():
     parser = argparse.ArgumentParser(description="Process large URL datasets in chunks")
@@ -112,16 +109,12 @@ def main():
     logger.info(f"Output file: {args.output}")
     logger.info(f"Target output directory: {args.target_output_dir}")
     
-    # Split the file into chunks
-    chunk_files = split_large_file(args.input_file, args.chunk_size)
-    logger.info(f"Created {len(chunk_files)} chunks")
-    
-    # Process each chunk
-    process_chunks(chunk_files, args.output, "validation", args.target_output_dir, logger)
+    # Stream the input in chunks; only the line count is needed up front
+    total_lines = count_lines(args.input_file)
+    total_chunks = (total_lines + args.chunk_size - 1) // args.chunk_size
+    logger.info(f"Processing {total_lines} URLs in {total_chunks} chunks")
     
-    # Clean up chunk files
-    for chunk_file in chunk_files:
-        chunk_file.unlink()
+    process_chunks(iter_chunks(args.input_file, args.chunk_size), total_chunks, args.output, "validation", args.target_output_dir, logger)
     
     logger.success("Processing complete!")
 
@@ -1,36 +1,201 @@
+import asyncio
+import aiohttp
 import hashlib
+import itertools
+import sqlite3
 import requests
 import urllib3
 from pathlib import Path
-from typing import List, Dict, Any, Set
-import concurrent.futures
-from tqdm import tqdm
+from collections import defaultdict
+from typing import AsyncIterator, Awaitable, Callable, Iterable, List, Dict, Any, Set
+from tqdm.asyncio import tqdm
 import time
+from urllib.parse import urlsplit, urlunsplit
 
 from common.logger import Logger
 from common.utils import ensure_dir
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-def download_and_hash_fast(url: str, timeout: int) -> tuple[str, str | None]:
-    """Fast download and hash function with minimal overhead."""
+# Bodies of any other type (images, fonts, binaries) are not worth downloading to hash;
+# octet-stream is kept because misconfigured servers commonly serve JS that way
+HASHABLE_CONTENT_TYPES = ('javascript', 'ecmascript', 'text/', 'json', 'octet-stream')
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so trivially different spellings map to the same key (case-insensitive scheme/host, sorted query, no fragment)."""
+    parts = urlsplit(url)
+    query = '&'.join(sorted(parts.query.split('&'))) if parts.query else ''
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ''))
+
+def interleave_by_host(urls: List[str]) -> List[str]:
+    """Order URLs round-robin across hosts so one busy host does not hold up the whole window."""
+    by_host: Dict[str, List[str]] = defaultdict(list)
+    for url in urls:
+        by_host[urlsplit(url).netloc.lower()].append(url)
+    return [url for batch in itertools.zip_longest(*by_host.values()) for url in batch if url is not None]
+
+async def download_and_hash_fast(session: aiohttp.ClientSession, url: str, max_bytes: int = 262144) -> tuple[str, bytes | None]:
+    """
+    Fast download and hash coroutine with minimal overhead.
+    Only the first max_bytes of the body are read and hashed; for truncated bodies the
+    Content-Length is mixed into the hash so same-prefix files of different sizes stay distinct.
+    """
     try:
-        # Use a single request with optimized settings
-        response = requests.get(
-            url, 
-            timeout=timeout, 
-            allow_redirects=True, 
-            verify=False,
-            headers={'User-Agent': 'MJSRecon/1.0'},
-            stream=False  # Load entire content for hashing
-        )
-        
-        if response.status_code == 200 and response.content:
-            return url, hashlib.sha256(response.content).hexdigest()
+        async with session.get(url) as response:
+            if response.status != 200:
+                return url, None
+            
+            # Bail out on the headers alone before any of the body is transferred
+            content_type = response.headers.get('Content-Type', '').lower()
+            if content_type and not any(t in content_type for t in HASHABLE_CONTENT_TYPES):
+                return url, None
+            
+            file_hash = hashlib.sha256()
+            read = 0
+            async for chunk in response.content.iter_chunked(65536):
+                # Chunk sizes vary, so clip to exactly max_bytes to keep the hash stable
+                chunk = chunk[:max_bytes - read]
+                file_hash.update(chunk)
+                read += len(chunk)
+                if read >= max_bytes:
+                    file_hash.update(response.headers.get('Content-Length', '').encode())
+                    break
+            
+            if read:
+                # 128 bits of the raw digest is plenty for deduplication and keeps seen_hashes small
+                return url, file_hash.digest()[:16]
     except Exception:
         pass
     return url, None
 
+async def head_key(session: aiohttp.ClientSession, url: str) -> tuple[str, tuple | None]:
+    """
+    HEAD a URL and return a (host, ETag, Content-Length) key, or None when the server
+    does not expose an ETag. A URL whose key no other URL shares serves a file of its own;
+    a shared key is only a hint, as weak or per-deployment ETags can repeat across files.
+    """
+    try:
+        async with session.head(url, allow_redirects=True) as response:
+            etag = response.headers.get('ETag')
+            if response.status == 200 and etag:
+                return url, (urlsplit(str(response.url)).netloc.lower(), etag, response.headers.get('Content-Length'))
+    except Exception:
+        pass
+    return url, None
+
+def load_hash_cache(cache_file: Path, ttl: int, max_bytes: int) -> tuple[sqlite3.Connection, Dict[str, bytes]]:
+    """
+    Open the per-target SQLite hash cache, drop expired entries and return the fresh
+    url -> digest mapping. Entries hashed with a different max_bytes are ignored.
+    """
+    conn = sqlite3.connect(cache_file)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('CREATE TABLE IF NOT EXISTS hashes (url TEXT PRIMARY KEY, digest BLOB NOT NULL, max_bytes INTEGER NOT NULL, fetched_at REAL NOT NULL)')
+    with conn:
+        conn.execute('DELETE FROM hashes WHERE fetched_at < ?', (time.time() - ttl,))
+    cached = dict(conn.execute('SELECT url, digest FROM hashes WHERE max_bytes = ?', (max_bytes,)))
+    return conn, cached
+
+def save_hash_cache(conn: sqlite3.Connection, fetched: Dict[str, bytes], max_bytes: int):
+    """Store freshly computed digests and close the cache."""
+    now = time.time()
+    with conn:
+        conn.executemany(
+            'INSERT OR REPLACE INTO hashes (url, digest, max_bytes, fetched_at) VALUES (?, ?, ?, ?)',
+            ((url, digest, max_bytes, now) for url, digest in fetched.items())
+        )
+    conn.close()
+
+def progress_opts(total: int) -> Dict[str, Any]:
+    """tqdm settings that redraw at most ~1000 times per bar, keeping update() cheap on huge inputs."""
+    return {'miniters': max(1, total // 1000), 'mininterval': 0.5, 'smoothing': 0}
+
+async def bounded_as_completed(func: Callable[[str], Awaitable], items: Iterable[str], limit: int) -> AsyncIterator:
+    """
+    Yield func(item) results as they complete, keeping at most `limit` tasks in flight.
+    Memory stays O(limit) rather than O(len(items)) of pending coroutines and tasks.
+    """
+    items = iter(items)
+    pending = {asyncio.ensure_future(func(item)) for item in itertools.islice(items, limit)}
+    
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            yield task.result()
+        pending.update(asyncio.ensure_future(func(item)) for item in itertools.islice(items, len(done)))
+
+async def deduplicate_all(urls: List[str], target: str, config: Dict, logger: Logger,
+                          cached: Dict[str, bytes]) -> tuple[List[str], int, Dict[str, bytes]]:
+    """
+    Manages the asynchronous HEAD and hashing passes over a shared connection pool.
+    URLs with a cached digest (keyed by canonical URL) skip the network entirely.
+    Returns the unique URLs, the number of URLs kept on a unique ETag without fetching and the newly fetched digests.
+    """
+    timeout = aiohttp.ClientTimeout(total=config['timeouts']['download'])
+    # Resolve each host once per run instead of aiohttp's default 10s DNS cache expiry
+    # Per-host cap keeps a single CDN from soaking up every connection and triggering 429s
+    connector = aiohttp.TCPConnector(limit=config['download']['max_concurrent'], ssl=False,
+                                     limit_per_host=config['download'].get('max_per_host', 6),
+                                     ttl_dns_cache=config['download'].get('dns_cache_ttl', 300))
+    max_bytes = config['download'].get('hash_max_bytes', 262144)
+    window = 2 * config['download']['max_concurrent']
+    
+    unique_urls: List[str] = []
+    seen_hashes: Set[bytes] = set()
+    fetched: Dict[str, bytes] = {}
+    etag_unique = 0
+    
+    uncached_urls: List[str] = []
+    for url in urls:
+        file_hash = cached.get(canonicalize_url(url))
+        if file_hash is None:
+            uncached_urls.append(url)
+        elif file_hash not in seen_hashes:
+            seen_hashes.add(file_hash)
+            unique_urls.append(url)
+    if cached:
+        logger.info(f"[{target}] {len(urls) - len(uncached_urls)} URLs resolved from the hash cache")
+    urls = interleave_by_host(uncached_urls)
+    
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers={'User-Agent': 'MJSRecon/1.0'}) as session:
+        # Pass 1: cheap HEAD requests bucket URLs by (host, ETag, Content-Length). A URL alone in
+        # its bucket is kept without downloading its body; every member of a shared bucket and
+        # every URL without an ETag is hashed, so a repeated ETag never drops a file unseen
+        if config['download'].get('head_prefilter', False):
+            etag_buckets: Dict[tuple, List[str]] = defaultdict(list)
+            hash_urls: List[str] = []
+            with tqdm(total=len(urls), desc=f"[{target}] Checking ETags", unit="url", leave=False, **progress_opts(len(urls))) as pbar:
+                async for url, key in bounded_as_completed(lambda u: head_key(session, u), urls, window):
+                    if key is None:
+                        hash_urls.append(url)
+                    else:
+                        etag_buckets[key].append(url)
+                    pbar.update(1)
+            
+            for bucket in etag_buckets.values():
+                if len(bucket) == 1:
+                    unique_urls.extend(bucket)
+                    etag_unique += 1
+                else:
+                    hash_urls.extend(bucket)
+            hash_urls = interleave_by_host(hash_urls)
+            
+            logger.info(f"[{target}] {etag_unique} URLs kept on a unique ETag, hashing {len(hash_urls)}")
+        else:
+            hash_urls = urls
+        
+        # Pass 2: download and hash the remaining URLs
+        with tqdm(total=len(hash_urls), desc=f"[{target}] Deduplicating", unit="url", leave=False, **progress_opts(len(hash_urls))) as pbar:
+            async for url, file_hash in bounded_as_completed(lambda u: download_and_hash_fast(session, u, max_bytes), hash_urls, window):
+                if file_hash:
+                    fetched[canonicalize_url(url)] = file_hash
+                if file_hash and file_hash not in seen_hashes:
+                    seen_hashes.add(file_hash)
+                    unique_urls.append(url)
+                pbar.update(1)
+    
+    return unique_urls, etag_unique, fetched
+
 def run(args: Any, config: Dict, logger: Logger, workflow_data: Dict) -> Dict:
     """
     Fast deduplication of URLs by fetching their content and comparing hashes.
@@ -42,44 +207,51 @@ def run(args: Any, config: Dict, logger: Logger, workflow_data: Dict) -> Dict:
         logger.warning(f"[{target}] No live URLs to process for deduplication. Skipping.")
         return {"deduplicated_urls": []}
 
-    logger.info(f"[{target}] Starting fast content-based deduplication for {len(live_urls)} URLs...")
+    # Drop URL-level duplicates up front so each distinct resource is only fetched once
+    canonical_urls: Dict[str, str] = {}
+    for url in live_urls:
+        canonical_urls.setdefault(canonicalize_url(url), url)
+    fetch_urls = list(canonical_urls.values())
+    url_duplicates = len(live_urls) - len(fetch_urls)
     
-    unique_urls: List[str] = []
-    seen_hashes: Set[str] = set()
-    timeout = config['timeouts']['download']
-    max_workers = min(config['download']['max_concurrent'], 50)  # Cap at 50 workers
+    logger.info(f"[{target}] Starting fast content-based deduplication for {len(fetch_urls)} URLs "
+                f"({url_duplicates} skipped as URL duplicates)...")
     
     start_time = time.time()
     
-    with tqdm(total=len(live_urls), desc=f"[{target}] Deduplicating", unit="url", leave=False) as pbar:
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks at once
-            future_to_url = {
-                executor.submit(download_and_hash_fast, url, timeout): url 
-                for url in live_urls
-            }
-            
-            # Process results as they complete
-            for future in concurrent.futures.as_completed(future_to_url):
-                url, file_hash = future.result()
-                if file_hash and file_hash not in seen_hashes:
-                    seen_hashes.add(file_hash)
-                    unique_urls.append(url)
-                pbar.update(1)
+    target_output_dir = workflow_data['target_output_dir']
+    max_bytes = config['download'].get('hash_max_bytes', 262144)
+    conn, cached = None, {}
+    if config['download'].get('hash_cache_enabled', True):
+        try:
+            conn, cached = load_hash_cache(target_output_dir / config['files']['dedup_hash_cache'],
+                                           config['download'].get('hash_cache_ttl', 86400), max_bytes)
+        except sqlite3.Error as e:
+            logger.warning(f"[{target}] Could not open hash cache, hashing everything: {e}")
+    
+    unique_urls, etag_unique, fetched = asyncio.run(
+        deduplicate_all(fetch_urls, target, config, logger, cached)
+    )
+    
+    if conn is not None:
+        try:
+            save_hash_cache(conn, fetched, max_bytes)
+        except sqlite3.Error as e:
+            logger.warning(f"[{target}] Could not update hash cache: {e}")
 
     end_time = time.time()
     duplicates_removed = len(live_urls) - len(unique_urls)
     processing_time = end_time - start_time
-    urls_per_second = len(live_urls) / processing_time if processing_time > 0 else 0
+    urls_per_second = len(fetch_urls) / processing_time if processing_time > 0 else 0
     
     logger.success(f"[{target}] Deduplication complete in {processing_time:.2f}s ({urls_per_second:.1f} URLs/sec)")
-    logger.success(f"[{target}] Removed {duplicates_removed} duplicates, {len(unique_urls)} unique files remain.")
+    logger.success(f"[{target}] Removed {duplicates_removed} duplicates ({url_duplicates} by URL, "
+                   f"{duplicates_removed - url_duplicates} after fetching), {len(unique_urls)} unique files remain "
+                   f"({etag_unique} kept on a unique ETag without fetching).")
     
-    target_output_dir = workflow_data['target_output_dir']
     deduplicated_file = target_output_dir / config['files']['deduplicated_js']
-    with deduplicated_file.open('w') as f:
-        for url in sorted(unique_urls):
-            f.write(f"{url}\n")
+    with deduplicated_file.open('w', buffering=1 << 20) as f:
+        f.writelines(f"{url}\n" for url in sorted(unique_urls))
     logger.info(f"[{target}] Deduplicated URLs saved to {deduplicated_file}")
     
     return {"deduplicated_urls": unique_urls}
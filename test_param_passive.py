@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Test script for the param_passive module helpers.
+"""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from param_passive.param_passive import extract_parameter_keys
+
+def test_extract_parameter_keys():
+    """Keys are collected once each, including blank values and bare flags, and are URL-decoded."""
+    print("Testing extract_parameter_keys...")
+
+    assert extract_parameter_keys("a=1&b=&a=2&c") == {"a", "b", "c"}
+    assert extract_parameter_keys("x%5B%5D=1&y+z=2") == {"x[]", "y z"}
+    assert extract_parameter_keys("") == set()
+
+    print("✓ extract_parameter_keys test passed")
+
+def main():
+    """Run all tests."""
+    print("Starting param_passive tests...\n")
+
+    try:
+        test_extract_parameter_keys()
+
+        print("\n🎉 All tests passed!")
+
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
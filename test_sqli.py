@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQLi module helpers.
+"""
+import sys
+import os
+import tempfile
+import threading
+import time
+import requests
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from unittest.mock import Mock
+from urllib.parse import urlparse, parse_qs
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common.logger import Logger
+from sqli.sqli_recon import (run_gf_uro_pipeline, ProbeProgress, build_probe_session,
+                              timed_get, measure_baseline, HostBaselines, shorten_payload,
+                              probe_elapsed, send_timed_probes, run_probe_tasks,
+                              filter_injectable_urls, prepare_injection, inject_payload, has_sql_param)
+
+# Stand-ins for the real tools: gf keeps URLs with a parameter, uro drops repeats
+FAKE_GF = """import sys
+for line in sys.stdin:
+    if '=' in line:
+        sys.stdout.write(line)
+"""
+FAKE_URO = """import sys
+sys.stdout.writelines(sorted(set(sys.stdin)))
+"""
+SLOW_URO = """import time
+time.sleep(30)
+"""
+
+def write_script(path: Path, source: str) -> Path:
+    """Write an executable Python script and return its path"""
+    path.write_text(f"#!{sys.executable}\n{source}")
+    path.chmod(0o755)
+    return path
+
+class SleepHandler(BaseHTTPRequestHandler):
+    """
+    Answers a GET after sleeping for the `sleep` query parameter, in seconds. The body is
+    `size` bytes and, after its headers and first half, stalls for `body_sleep` seconds.
+    /redirect paths 302 to /. Every requested path is recorded.
+    """
+
+    requested = []
+
+    def do_GET(self):
+        SleepHandler.requested.append(self.path)
+        if self.path.startswith('/redirect'):
+            self.send_response(302)
+            self.send_header('Location', '/' + self.path[len('/redirect'):])
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        params = parse_qs(urlparse(self.path).query)
+        time.sleep(float(params.get('sleep', ['0'])[0]))
+        body = b'x' * int(params.get('size', ['2'])[0])
+        half = len(body) // 2
+        try:
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body[:half])
+            self.wfile.flush()
+            time.sleep(float(params.get('body_sleep', ['0'])[0]))
+            self.wfile.write(body[half:])
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client already gave up on a timed-out probe
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server() -> ThreadingHTTPServer:
+    """Start a SleepHandler server on a free local port"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SleepHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def test_run_gf_uro_pipeline():
+    """URLs go through gf then uro without a shell; missing tools and timeouts come back like run_command."""
+    print("Testing run_gf_uro_pipeline...")
+
+    old_path = os.environ.get('PATH', '')
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        gf_path = str(write_script(temp_path / "gf", FAKE_GF))
+        uro_dir = temp_path / "bin"
+        uro_dir.mkdir()
+        write_script(uro_dir / "uro", FAKE_URO)
+        os.environ['PATH'] = f"{uro_dir}{os.pathsep}{old_path}"
+        try:
+            # More input than a pipe buffer holds, so the feeder and the reader must overlap
+            urls = {f"http://example.com/item.php?id={i}" for i in range(20000)} | {"http://example.com/static.js"}
+            exit_code, stdout, stderr = run_gf_uro_pipeline(gf_path, urls, timeout=60)
+            assert exit_code == 0, stderr
+            assert set(stdout.splitlines()) == urls - {"http://example.com/static.js"}
+
+            exit_code, stdout, stderr = run_gf_uro_pipeline(str(temp_path / "missing-gf"), urls)
+            assert (exit_code, stdout) == (-1, "") and "Command not found" in stderr
+
+            write_script(uro_dir / "uro", SLOW_URO)
+            exit_code, stdout, stderr = run_gf_uro_pipeline(gf_path, urls, timeout=1)
+            assert (exit_code, stdout) == (-1, "") and "timed out" in stderr
+
+            os.environ['PATH'] = str(temp_path / "empty")
+            exit_code, stdout, stderr = run_gf_uro_pipeline(gf_path, urls)
+            assert (exit_code, stdout, stderr) == (-1, "", "Command not found: uro")
+        finally:
+            os.environ['PATH'] = old_path
+
+    print("✓ run_gf_uro_pipeline test passed")
+
+def test_shorten_payload():
+    """SLEEP arguments are replaced and BENCHMARK counts scaled from the ~10 second originals."""
+    print("Testing shorten_payload...")
+
+    assert shorten_payload("1' AND SLEEP(10)-- -", 2) == "1' AND SLEEP(2)-- -"
+    assert shorten_payload("if(now()=sysdate(),sleep(10),0)", 3) == "if(now()=sysdate(),sleep(3),0)"
+    assert shorten_payload("BENCHMARK(10000000,MD5(1))", 2) == "BENCHMARK(2000000,MD5(1))"
+    assert shorten_payload("' OR '1'='1", 2) == "' OR '1'='1"
+
+    print("✓ shorten_payload test passed")
+
+def test_probe_elapsed():
+    """A probe's time is returned, a timeout becomes inf and a failed request None."""
+    print("Testing probe_elapsed...")
+
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_port}/"
+    logger = Mock(spec=Logger)
+    session = build_probe_session(2)
+    try:
+        assert 0.3 < probe_elapsed(session, base_url + "?sleep=0.3", {"X-Test": "1"}, 5, "slow", logger) < 1
+        assert probe_elapsed(session, base_url + "?sleep=1", None, 0.3, "stalled", logger) == float('inf')
+        assert probe_elapsed(session, "http://127.0.0.1:9/", None, 5, "closed port", logger) is None
+        logger.debug.assert_called_once_with("Connection error for closed port")
+    finally:
+        session.close()
+        server.shutdown()
+
+    print("✓ probe_elapsed test passed")
+
+def timed_probe(base_url: str, name: str, screen_sleep: float, confirm_sleep: float) -> tuple:
+    """A send_timed_probes probe whose screen and confirm requests sleep for the given seconds"""
+    return ((f"{base_url}?sleep={screen_sleep}&probe={name}-screen", None),
+            (f"{base_url}?sleep={confirm_sleep}&probe={name}-confirm", None), name, (name,))
+
+def test_send_timed_probes():
+    """A delayed screen is confirmed with the full payload; probes stop at the first confirmed delay."""
+    print("Testing send_timed_probes...")
+
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_port}/"
+    logger = Mock(spec=Logger)
+    session = build_probe_session(2)
+
+    def send(probes, timeout=5, baseline=0.0, stop=None, progress=None):
+        progress = progress or ProbeProgress(len(probes), logger, every=100)
+        return send_timed_probes(session, probes, timeout, 0.2, 0.4, logger, progress, stop, baseline)
+
+    try:
+        SleepHandler.requested = []
+        probes = [timed_probe(base_url, "fast", 0, 0), timed_probe(base_url, "slow", 0.3, 0.6),
+                  timed_probe(base_url, "after", 0, 0)]
+        progress = ProbeProgress(len(probes), logger, every=100)
+        hit = send(probes, progress=progress)
+        assert hit[0] == "slow" and 0.4 < hit[1] < 2, hit
+        assert progress.completed == 2
+        assert [path.rpartition('=')[2] for path in SleepHandler.requested] == ["fast-screen", "slow-screen", "slow-confirm"]
+
+        # The full payload is only sent after the screen is delayed, and must be delayed too
+        SleepHandler.requested = []
+        assert send([timed_probe(base_url, "unscreened", 0, 0.6)]) is None
+        assert send([timed_probe(base_url, "unconfirmed", 0.3, 0)]) is None
+        assert [path.rpartition('=')[2] for path in SleepHandler.requested] == [
+            "unscreened-screen", "unconfirmed-screen", "unconfirmed-confirm"]
+
+        # Redirects are followed, so the delay of the page they land on is measured
+        redirected = ((base_url + "redirect?sleep=0.3", None), (base_url + "redirect?sleep=0.6", None),
+                      "redirect", ("redirect",))
+        hit = send([redirected])
+        assert hit is not None and hit[0] == "redirect", hit
+
+        # A confirm that runs into the timeout counts as delayed
+        assert send([timed_probe(base_url, "stalled", 0.6, 0.6)], timeout=0.3) == ("stalled", 0.3)
+
+        # An unreachable host finds nothing
+        closed = (("http://127.0.0.1:9/", None), ("http://127.0.0.1:9/", None), "closed port", ("closed",))
+        assert send([closed]) is None
+
+        # Only the delay over the URL's baseline counts
+        assert send(probes, baseline=0.5) is None
+
+        # A set stop event ends the probes before anything is sent
+        stop = threading.Event()
+        stop.set()
+        progress = ProbeProgress(len(probes), logger, every=100)
+        assert send(probes, stop=stop, progress=progress) is None
+        assert progress.completed == 0
+    finally:
+        session.close()
+        server.shutdown()
+
+    print("✓ send_timed_probes test passed")
+
+def test_timed_get():
+    """The clock runs until the body is read, up to PROBE_DRAIN_MAX_BYTES; a stalled body is a timeout."""
+    print("Testing timed_get and measure_baseline...")
+
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_port}/"
+    session = build_probe_session(2)
+    try:
+        assert timed_get(session, base_url, None, 5) < 0.3
+
+        # A delay after the headers have been sent is still measured
+        assert 0.5 < timed_get(session, base_url + "?body_sleep=0.5", None, 5) < 2
+
+        # A stall past the first 64 KiB of a large body is not
+        assert timed_get(session, base_url + "?size=200000&body_sleep=1", None, 5) < 0.5
+
+        try:
+            timed_get(session, base_url + "?body_sleep=2", None, 0.3)
+            raise AssertionError("ReadTimeout was not raised")
+        except requests.exceptions.ReadTimeout:
+            pass
+
+        assert 0.3 < measure_baseline(session, base_url + "?sleep=0.3", 5) < 1
+        assert measure_baseline(session, "http://127.0.0.1:9/", 5) == 0.0
+    finally:
+        session.close()
+        server.shutdown()
+
+    print("✓ timed_get and measure_baseline test passed")
+
+def test_host_baselines():
+    """Each host is measured once, with the median of its samples, however many threads ask for it."""
+    print("Testing HostBaselines...")
+
+    server = start_server()
+    port = server.server_port
+    session = build_probe_session(8)
+    try:
+        SleepHandler.requested = []
+        baselines = HostBaselines(5)
+        results = run_probe_tasks([f"http://127.0.0.1:{port}/?sleep=0.2&n={i}" for i in range(8)],
+                                  lambda url: (baselines.get(session, url),), 8, Mock(spec=Logger))
+        assert len(results) == 8
+        assert len({baseline for baseline, in results}) == 1
+        assert 0.2 < results[0][0] < 1, results
+        assert len(SleepHandler.requested) == 3, SleepHandler.requested
+
+        # Another host name for the same server is measured on its own
+        assert 0.2 < baselines.get(session, f"http://localhost:{port}/?sleep=0.2") < 1
+        assert len(SleepHandler.requested) == 6
+
+        assert HostBaselines(5).get(session, "http://127.0.0.1:9/") == 0.0
+    finally:
+        session.close()
+        server.shutdown()
+
+    print("✓ HostBaselines test passed")
+
+def test_run_probe_tasks():
+    """Tasks run concurrently; empty results and failing tasks are left out."""
+    print("Testing run_probe_tasks...")
+
+    def probe_task(task):
+        if task == 3:
+            raise ValueError("probe failed")
+        time.sleep(0.2)
+        return (task,) if task % 2 else None
+
+    start = time.monotonic()
+    results = run_probe_tasks(list(range(8)), probe_task, 8, Mock(spec=Logger))
+    assert sorted(results) == [(1,), (5,), (7,)], results
+    assert time.monotonic() - start < 1
+    assert run_probe_tasks([], probe_task, 0, Mock(spec=Logger)) == []
+
+    print("✓ run_probe_tasks test passed")
+
+def test_filter_injectable_urls():
+    """Only URLs with a parameter value to replace are kept, in their original order."""
+    print("Testing filter_injectable_urls...")
+
+    logger = Mock(spec=Logger)
+    urls = ["http://x/a.php?id=1", "http://x/b.php", "http://x/c.php?flag", "http://x/d=1/e.php", "http://x/f.php?q=&g=2"]
+    assert filter_injectable_urls(urls, logger) == ["http://x/a.php?id=1", "http://x/f.php?q=&g=2"]
+    logger.info.assert_called_once_with("Skipping 3 URLs without an injectable parameter.")
+
+    logger = Mock(spec=Logger)
+    assert filter_injectable_urls(urls[:1], logger) == urls[:1]
+    logger.info.assert_not_called()
+
+    print("✓ filter_injectable_urls test passed")
+
+def test_prepare_and_inject_payload():
+    """The payload replaces the first parameter's value and the other parameters are kept."""
+    print("Testing prepare_injection and inject_payload...")
+
+    assert prepare_injection("http://x/p.php?id=1&b=2&c=3") == ("http://x/p.php?id=", "&b=2&c=3")
+    assert prepare_injection("http://x/p.php?id=1") == ("http://x/p.php?id=", "")
+    assert prepare_injection("http://x/p.php") == ("http://x/p.php", "")
+    assert prepare_injection("http://x/p.php?flag") == ("http://x/p.php?flag", "")
+    assert inject_payload("http://x/p.php?id=1&b=2", "'") == "http://x/p.php?id='&b=2"
+
+    print("✓ prepare_injection and inject_payload test passed")
+
+def test_has_sql_param():
+    """Known names, names ending in "id" and array-style names count; bare flags do not."""
+    print("Testing has_sql_param...")
+
+    assert has_sql_param("http://x/?id=1")
+    assert has_sql_param("http://x/?foo=1&Category=2")
+    assert has_sql_param("http://x/?user_id=5")
+    assert has_sql_param("http://x/?ID[]=5")
+    assert not has_sql_param("http://x/?foo=1&bar=2")
+    assert not has_sql_param("http://x/?id")
+    assert not has_sql_param("http://x/id.php")
+
+    print("✓ has_sql_param test passed")
+
+def main():
+    """Run all tests."""
+    print("Starting SQLi module tests...\n")
+
+    try:
+        test_run_gf_uro_pipeline()
+        test_shorten_payload()
+        test_probe_elapsed()
+        test_send_timed_probes()
+        test_timed_get()
+        test_host_baselines()
+        test_run_probe_tasks()
+        test_filter_injectable_urls()
+        test_prepare_and_inject_payload()
+        test_has_sql_param()
+
+        print("\n🎉 All tests passed!")
+
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared helpers in common.utils.
+"""
+import sys
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common.utils import sort_unique_files, diff_sorted_files, count_lines, stream_lines, read_unique_lines
+
+def test_sort_unique_and_diff_sorted_files():
+    """sort_unique_files merges and deduplicates; diff_sorted_files keeps lines only in the left file."""
+    print("Testing sort_unique_files and diff_sorted_files...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        first = temp_path / "first.txt"
+        second = temp_path / "second.txt"
+        first.write_text("b\na\nc\na\n")
+        second.write_text("d\nb\n")
+
+        merged = temp_path / "merged.txt"
+        assert sort_unique_files([first, second], merged)[0] == 0
+        assert merged.read_text() == "a\nb\nc\nd\n"
+        assert count_lines(merged) == 4
+
+        old = temp_path / "old.txt"
+        assert sort_unique_files([second], old)[0] == 0
+        new_only = temp_path / "new_only.txt"
+        assert diff_sorted_files(merged, old, new_only)[0] == 0
+        assert new_only.read_text() == "a\nc\n"
+
+    print("✓ sort_unique_files and diff_sorted_files test passed")
+
+def test_stream_lines():
+    """Lines arrive as the command writes them; failures, timeouts and early stops are handled."""
+    print("Testing stream_lines...")
+
+    # Output is yielded line by line and a clean exit raises nothing
+    cmd = [sys.executable, '-c', 'print("a"); print("b")']
+    assert list(stream_lines(cmd, 10)) == ["a\n", "b\n"]
+
+    # An exit code outside ok_codes raises after the last line, carrying stderr
+    cmd = [sys.executable, '-c', 'import sys; print("partial"); sys.stderr.write("boom"); sys.exit(3)']
+    lines = []
+    try:
+        for line in stream_lines(cmd, 10):
+            lines.append(line)
+        raise AssertionError("CalledProcessError was not raised")
+    except subprocess.CalledProcessError as e:
+        assert e.returncode == 3
+        assert e.stderr == "boom"
+    assert lines == ["partial\n"]
+
+    # Exit codes listed in ok_codes are accepted
+    cmd = [sys.executable, '-c', 'import sys; sys.exit(1)']
+    assert list(stream_lines(cmd, 10, ok_codes=(0, 1))) == []
+
+    # A process that keeps writing is killed at the deadline
+    cmd = [sys.executable, '-c', 'import time\nwhile True:\n    print("x", flush=True)\n    time.sleep(0.01)']
+    start = time.monotonic()
+    try:
+        for _ in stream_lines(cmd, 1):
+            pass
+        raise AssertionError("TimeoutExpired was not raised")
+    except subprocess.TimeoutExpired:
+        pass
+    assert time.monotonic() - start < 5
+
+    # Stopping early kills the process instead of waiting for it
+    cmd = [sys.executable, '-c', 'import time; print("first", flush=True); time.sleep(30)']
+    start = time.monotonic()
+    lines = stream_lines(cmd, 60)
+    assert next(lines) == "first\n"
+    lines.close()
+    assert time.monotonic() - start < 5
+
+    print("✓ stream_lines test passed")
+
+def test_read_unique_lines():
+    """Lines are stripped, deduplicated and blank lines dropped; invalid UTF-8 is replaced."""
+    print("Testing read_unique_lines...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        urls = temp_path / "urls.txt"
+        urls.write_bytes(b"a\r\nb\n\n  a  \nb\n\xffc")
+        assert read_unique_lines(urls) == {"a", "b", "\ufffdc"}
+
+        empty = temp_path / "empty.txt"
+        empty.write_bytes(b"")
+        assert read_unique_lines(empty) == set()
+
+    print("✓ read_unique_lines test passed")
+
+def main():
+    """Run all tests."""
+    print("Starting common.utils tests...\n")
+
+    try:
+        test_sort_unique_and_diff_sorted_files()
+        test_stream_lines()
+        test_read_unique_lines()
+
+        print("\n🎉 All tests passed!")
+
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()